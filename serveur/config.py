@@ -5,8 +5,9 @@ Utilise Pydantic Settings pour charger la configuration depuis
 les variables d'environnement et le fichier .env.
 """
 
-from typing import Literal
-from pydantic import Field, field_validator
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Literal, Optional
+from pydantic import Field, PrivateAttr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,6 +21,16 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    # Champs masqués par model_dump_safe
+    _SECRET_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        "openweather_api_key",
+        "google_client_secret",
+    })
+
+    # Cache de model_dump_safe, invalidé si un champ change (assignation,
+    # model_copy(update=...))
+    _safe_dump: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
     # Server Configuration
     server_host: str = Field(
         default="0.0.0.0",
@@ -47,17 +58,48 @@ class Settings(BaseSettings):
         le=8192,
         description="Taille de la fenêtre de contexte du LLM"
     )
-    llm_n_threads: int = Field(
-        default=8,
+    llm_n_threads: Optional[int] = Field(
+        default=None,
         ge=1,
         le=32,
-        description="Nombre de threads CPU pour l'inférence"
+        description="Nombre de threads CPU pour l'inférence (défaut: min(16, cœurs))"
+    )
+    llm_n_batch: int = Field(
+        default=2048,
+        ge=32,
+        description="Tokens de prompt traités par appel llama_decode (préremplissage)"
+    )
+    llm_n_ubatch: int = Field(
+        default=512,
+        ge=32,
+        description="Taille des micro-batchs physiques du préremplissage"
+    )
+    llm_use_mlock: bool = Field(
+        default=False,
+        description="Verrouiller le modèle en RAM (évite les défauts de page)"
+    )
+    llm_kv_cache_type: Literal["f16", "q8_0", "q4_0"] = Field(
+        default="q8_0",
+        description="Type du cache KV (q8_0/q4_0 quantifiés, nécessitent flash attention)"
+    )
+    llm_flash_attn: bool = Field(
+        default=True,
+        description="Utiliser le noyau d'attention fusionné (flash attention) de llama.cpp"
     )
     llm_n_gpu_layers: int = Field(
         default=0,
         ge=0,
         description="Nombre de couches à offloader sur GPU (0=CPU-only)"
     )
+    llm_preferred_quant: str = Field(
+        default="Q4_K_M",
+        description="Quantification GGUF recommandée (logs et erreurs de chargement)"
+    )
+    llm_prompt_cache_bytes: int = Field(
+        default=0,  # Désactivé: utile seulement si les prompts partagent un préfixe
+        ge=0,
+        description="Taille du cache d'états KV entre les tours (0=désactivé)"
+    )
 
     # Redis Configuration
     redis_url: str = Field(
@@ -69,6 +111,16 @@ class Settings(BaseSettings):
         ge=3600,
         description="TTL du contexte conversationnel (secondes)"
     )
+    redis_max_connections: int = Field(
+        default=32,
+        ge=1,
+        description="Taille maximale du pool de connexions Redis"
+    )
+    redis_health_check_interval: int = Field(
+        default=30,
+        ge=0,
+        description="Intervalle de vérification des connexions inactives (secondes, 0=désactivé)"
+    )
 
     # OpenWeatherMap API
     openweather_api_key: str = Field(
@@ -128,24 +180,53 @@ class Settings(BaseSettings):
         """Retourne True si en mode production."""
         return self.environment == "production"
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Assigne un attribut et invalide le cache de model_dump_safe."""
+        super().__setattr__(name, value)
+        if name in self.model_fields:
+            self._safe_dump = None
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "Settings":
+        """Copie la configuration sans reprendre le cache de model_dump_safe."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied._safe_dump = None
+        return copied
+
     def model_dump_safe(self) -> dict:
         """
         Exporte la configuration en masquant les secrets.
 
+        Le résultat est calculé au premier appel puis mis en cache.
+
         Returns:
             Dict avec les secrets masqués
         """
-        config = self.model_dump()
-        # Masquer les secrets
-        secrets = [
-            "openweather_api_key",
-            "google_client_secret",
-        ]
-        for secret in secrets:
-            if secret in config and config[secret]:
-                config[secret] = "***MASKED***"
-        return config
-
-
-# Instance globale de configuration
-settings = Settings()
+        if self._safe_dump is None:
+            config = self.model_dump()
+            # Masquer les secrets
+            for secret in self._SECRET_FIELDS & config.keys():
+                if config[secret]:
+                    config[secret] = "***MASKED***"
+            self._safe_dump = config
+        return self._safe_dump.copy()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Retourne l'instance unique de configuration.
+
+    Construite au premier appel puis mise en cache. Utilisable comme
+    dépendance FastAPI (Depends(get_settings)); get_settings.cache_clear()
+    force un rechargement (tests).
+
+    Returns:
+        Instance Settings partagée
+    """
+    return Settings()
+
+
+# Instance globale de configuration (compatibilité)
+settings = get_settings()
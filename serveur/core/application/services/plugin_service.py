@@ -4,15 +4,62 @@ Service de gestion des plugins.
 Gère le chargement, l'exécution et le cycle de vie des plugins.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, List, Mapping, Optional, Any, Tuple, Type
 from pathlib import Path
+from types import MappingProxyType, ModuleType
+import asyncio
 import importlib.util
+import inspect
 import json
-from datetime import datetime
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle, repli sur json (stdlib)
+    orjson = None  # type: ignore[assignment]
 
 from core.domain.interfaces import PluginInterface
 from shared.errors import PluginExecutionError, ConfigurationError
 
+logger = logging.getLogger(__name__)
+
+# Champs obligatoires dans plugin.json
+_REQUIRED_MANIFEST_FIELDS = frozenset({"name", "version", "description", "intents"})
+
+# Liste optionnelle des plugins désactivés, lue avant tout manifest
+_DISABLED_PLUGINS_FILE = ".disabled"
+
+
+def _find_subclass_in_module(
+    base: type, module: ModuleType
+) -> Optional[Type[PluginInterface]]:
+    """
+    Recherche récursivement une sous-classe concrète de base définie dans un module.
+
+    Seules les classes du namespace du module exécuté sont retenues: après
+    un rechargement, les classes de l'import précédent (même __module__,
+    encore référencées par le cache) sont ignorées.
+
+    Args:
+        base: Classe de base à parcourir
+        module: Module où la sous-classe doit être définie
+
+    Returns:
+        Première sous-classe trouvée ou None
+    """
+    for cls in base.__subclasses__():
+        if (
+            issubclass(cls, PluginInterface)
+            and getattr(module, cls.__name__, None) is cls
+            and not inspect.isabstract(cls)
+        ):
+            return cls
+        found = _find_subclass_in_module(cls, module)
+        if found is not None:
+            return found
+    return None
+
 
 class PluginLoader:
     """
@@ -32,13 +79,67 @@ class PluginLoader:
         self.plugins_dir = plugins_dir
         self.loaded_plugins: Dict[str, PluginInterface] = {}
         self.plugin_manifests: Dict[str, Dict[str, Any]] = {}
+        # Cache {handler.py: (mtime_ns, classe du plugin)}
+        self._module_cache: Dict[Path, Tuple[int, Type[PluginInterface]]] = {}
+        # Contextes LLM par plugin et contexte combiné (invalidé au load/unload)
+        self._plugin_contexts: Dict[str, str] = {}
+        self._context_cache: Optional[str] = None
+        self._context_cache_bytes: Optional[bytes] = None
+
+    def _read_disabled_plugins(self) -> FrozenSet[str]:
+        """
+        Lit la liste des plugins désactivés (plugins/.disabled).
 
-    def _load_manifest(self, plugin_path: Path) -> Dict[str, Any]:
+        Un nom de plugin par ligne, les lignes vides et commentaires (#)
+        sont ignorés. Le flag "enabled" du manifest reste appliqué pour
+        les plugins absents de cette liste.
+
+        Returns:
+            Noms des plugins à ignorer (vide si le fichier n'existe pas)
+        """
+        try:
+            with open(
+                self.plugins_dir / _DISABLED_PLUGINS_FILE, "r", encoding="utf-8"
+            ) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return frozenset()
+
+        return frozenset(
+            line.strip()
+            for line in lines
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+
+    @staticmethod
+    def _read_manifest(plugin_path: Path) -> Optional[bytes]:
+        """
+        Lit le contenu brut du manifest d'un plugin.
+
+        Opération bloquante, pouvant être exécutée dans un thread.
+
+        Args:
+            plugin_path: Chemin du dossier du plugin
+
+        Returns:
+            Contenu du fichier plugin.json ou None s'il n'existe pas
+        """
+        try:
+            # Ouvrir directement plutôt que exists() + open (un seul appel système)
+            with open(plugin_path / "plugin.json", "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _load_manifest(
+        self, plugin_path: Path, raw_manifest: Optional[bytes] = None
+    ) -> Dict[str, Any]:
         """
         Charge le manifest d'un plugin.
 
         Args:
             plugin_path: Chemin du dossier du plugin
+            raw_manifest: Contenu déjà lu du manifest (défaut: lu depuis le disque)
 
         Returns:
             Dictionnaire contenant le manifest
@@ -48,34 +149,44 @@ class PluginLoader:
         """
         manifest_path = plugin_path / "plugin.json"
 
-        if not manifest_path.exists():
+        if raw_manifest is None:
+            raw_manifest = self._read_manifest(plugin_path)
+
+        if raw_manifest is None:
             raise ConfigurationError(
                 field="plugin.json",
                 message=f"Manifest not found for plugin at {plugin_path}",
-                timestamp=datetime.utcnow(),
             )
 
         try:
-            with open(manifest_path, "r", encoding="utf-8") as f:
-                manifest = json.load(f)
+            if orjson is not None:
+                manifest = orjson.loads(raw_manifest)
+            else:
+                manifest = json.loads(raw_manifest)
+
+            if not isinstance(manifest, dict):
+                raise ConfigurationError(
+                    field="plugin.json",
+                    message=f"Manifest must be a JSON object in {manifest_path}",
+                )
 
             # Valider les champs requis
-            required_fields = ["name", "version", "description", "intents"]
-            for field in required_fields:
-                if field not in manifest:
-                    raise ConfigurationError(
-                        field=field,
-                        message=f"Missing required field '{field}' in {manifest_path}",
-                        timestamp=datetime.utcnow(),
-                    )
+            missing_fields = sorted(_REQUIRED_MANIFEST_FIELDS - manifest.keys())
+            if missing_fields:
+                field = missing_fields[0]
+                raise ConfigurationError(
+                    field=field,
+                    message=f"Missing required field '{field}' in {manifest_path}",
+                    context={"missing_fields": missing_fields},
+                )
 
             return manifest
 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, ValueError) as e:
+            # orjson.JSONDecodeError hérite de json.JSONDecodeError et ValueError
             raise ConfigurationError(
                 field="plugin.json",
                 message=f"Invalid JSON in {manifest_path}: {str(e)}",
-                timestamp=datetime.utcnow(),
             )
 
     def _load_plugin_module(
@@ -96,14 +207,13 @@ class PluginLoader:
         """
         handler_path = plugin_path / "handler.py"
 
-        if not handler_path.exists():
-            raise ConfigurationError(
-                field="handler.py",
-                message=f"Handler not found for plugin {plugin_name}",
-                timestamp=datetime.utcnow(),
-            )
-
         try:
+            # Réutiliser la classe si le handler n'a pas changé depuis le dernier import
+            mtime_ns = handler_path.stat().st_mtime_ns
+            cached = self._module_cache.get(handler_path)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]()
+
             # Import dynamique du module
             spec = importlib.util.spec_from_file_location(
                 f"plugins.{plugin_name}.handler", handler_path
@@ -112,34 +222,51 @@ class PluginLoader:
                 raise ConfigurationError(
                     field="handler.py",
                     message=f"Failed to load spec for {handler_path}",
-                    timestamp=datetime.utcnow(),
                 )
 
             module = importlib.util.module_from_spec(spec)
+
+            # Les classes créées par exec_module apparaissent dans __subclasses__
+            known_subclasses = set(PluginInterface.__subclasses__())
             spec.loader.exec_module(module)
 
-            # Trouver la classe du plugin (doit se terminer par "Plugin")
-            plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (
-                    isinstance(attr, type)
-                    and issubclass(attr, PluginInterface)
-                    and attr is not PluginInterface
-                ):
-                    plugin_class = attr
-                    break
+            # Trouver la classe du plugin parmi les nouvelles sous-classes directes
+            plugin_class = next(
+                (
+                    cls
+                    for cls in PluginInterface.__subclasses__()
+                    if cls not in known_subclasses and not inspect.isabstract(cls)
+                ),
+                None,
+            )
+            if plugin_class is None:
+                # Héritage via une classe intermédiaire
+                plugin_class = _find_subclass_in_module(PluginInterface, module)
 
             if plugin_class is None:
                 raise ConfigurationError(
                     field="handler.py",
                     message=f"No PluginInterface subclass found in {handler_path}",
-                    timestamp=datetime.utcnow(),
                 )
 
+            self._module_cache[handler_path] = (mtime_ns, plugin_class)
+
             # Instancier le plugin
             return plugin_class()
 
+        except FileNotFoundError as e:
+            # Pas de exists() préalable: stat() échoue si le handler manque
+            if e.filename != str(handler_path):
+                raise ConfigurationError(
+                    field="handler.py",
+                    message=f"Failed to load plugin {plugin_name}: {str(e)}",
+                    context={"error_type": type(e).__name__},
+                )
+            raise ConfigurationError(
+                field="handler.py",
+                message=f"Handler not found for plugin {plugin_name}",
+            )
+
         except Exception as e:
             if isinstance(e, ConfigurationError):
                 raise
@@ -147,7 +274,6 @@ class PluginLoader:
                 field="handler.py",
                 message=f"Failed to load plugin {plugin_name}: {str(e)}",
                 context={"error_type": type(e).__name__},
-                timestamp=datetime.utcnow(),
             )
 
     async def load_plugin(self, plugin_name: str) -> None:
@@ -166,11 +292,29 @@ class PluginLoader:
             raise ConfigurationError(
                 field="plugin_directory",
                 message=f"Plugin directory not found: {plugin_path}",
-                timestamp=datetime.utcnow(),
             )
 
+        await self._load_plugin_from_path(plugin_path, plugin_name)
+
+    async def _load_plugin_from_path(
+        self,
+        plugin_path: Path,
+        plugin_name: str,
+        raw_manifest: Optional[bytes] = None,
+    ) -> None:
+        """
+        Charge un plugin depuis un dossier déjà identifié comme tel.
+
+        Args:
+            plugin_path: Chemin du dossier du plugin
+            plugin_name: Nom du plugin
+            raw_manifest: Contenu déjà lu du manifest (optionnel)
+
+        Raises:
+            ConfigurationError: Si le plugin ne peut pas être chargé
+        """
         # Charger le manifest
-        manifest = self._load_manifest(plugin_path)
+        manifest = self._load_manifest(plugin_path, raw_manifest)
 
         # Vérifier si le plugin est activé
         if not manifest.get("enabled", True):
@@ -182,32 +326,98 @@ class PluginLoader:
         # Appeler le hook on_load
         await plugin.on_load()
 
-        # Stocker le plugin et son manifest
+        # Stocker le plugin, son manifest et son contexte LLM (statique)
         self.loaded_plugins[plugin_name] = plugin
         self.plugin_manifests[plugin_name] = manifest
+        self._plugin_contexts[plugin_name] = (
+            f"## {manifest['description']}\n{plugin.get_prompt_context()}"
+        )
+        self._context_cache = None
+        self._context_cache_bytes = None
 
     async def load_all_plugins(self) -> None:
         """
         Charge tous les plugins du dossier plugins/.
 
-        Ignore les dossiers commençant par _ (comme _template).
+        Ignore les dossiers commençant par _ (comme _template) et les
+        plugins listés dans plugins/.disabled, sans lire leur manifest.
         """
-        if not self.plugins_dir.exists():
+        try:
+            # scandir: le type de chaque entrée est connu sans stat supplémentaire
+            with os.scandir(self.plugins_dir) as entries:
+                plugin_entries = [
+                    entry
+                    for entry in entries
+                    # Ignorer les dossiers spéciaux
+                    if not entry.name.startswith("_") and entry.is_dir()
+                ]
+        except FileNotFoundError:
             return
 
-        for plugin_dir in self.plugins_dir.iterdir():
-            if not plugin_dir.is_dir():
-                continue
+        disabled_plugins = self._read_disabled_plugins()
+        if disabled_plugins:
+            plugin_entries = [
+                entry for entry in plugin_entries if entry.name not in disabled_plugins
+            ]
+
+        # Ordre du dossier (trié par nom), indépendant de l'ordre de fin des
+        # chargements parallèles
+        plugin_entries.sort(key=lambda entry: entry.name)
+        plugin_paths = [Path(entry.path) for entry in plugin_entries]
+
+        # Lire tous les manifests en parallèle (I/O dans des threads)
+        raw_manifests = await asyncio.gather(
+            *(asyncio.to_thread(self._read_manifest, path) for path in plugin_paths)
+        )
+
+        # Les hooks on_load (connexions, clients HTTP...) s'exécutent en parallèle
+        await asyncio.gather(
+            *(
+                self._safe_load(path, entry.name, raw_manifest)
+                for path, entry, raw_manifest in zip(
+                    plugin_paths, plugin_entries, raw_manifests
+                )
+            )
+        )
+
+    async def _safe_load(
+        self,
+        plugin_path: Path,
+        plugin_name: str,
+        raw_manifest: Optional[bytes] = None,
+    ) -> None:
+        """
+        Charge un plugin sans propager ses erreurs.
 
-            # Ignorer les dossiers spéciaux
-            if plugin_dir.name.startswith("_"):
-                continue
+        Les chargements étant parallèles, une erreur propagée interromprait
+        load_all_plugins sans attendre les autres plugins.
 
-            try:
-                await self.load_plugin(plugin_dir.name)
-            except ConfigurationError as e:
-                # Log l'erreur mais continue le chargement des autres plugins
-                print(f"Warning: Failed to load plugin {plugin_dir.name}: {e.message}")
+        Args:
+            plugin_path: Chemin du dossier du plugin
+            plugin_name: Nom du plugin
+            raw_manifest: Contenu déjà lu du manifest (optionnel)
+        """
+        try:
+            await self._load_plugin_from_path(plugin_path, plugin_name, raw_manifest)
+        except ConfigurationError as e:
+            # Log l'erreur mais continue le chargement des autres plugins
+            logger.warning(
+                "Failed to load plugin %s: %s",
+                plugin_name,
+                e.message,
+                exc_info=True,
+                extra={"plugin_name": plugin_name},
+            )
+        except Exception as e:
+            # Erreur d'un hook on_load (connexion, client HTTP...)
+            logger.warning(
+                "Failed to load plugin %s: %s: %s",
+                plugin_name,
+                type(e).__name__,
+                e,
+                exc_info=True,
+                extra={"plugin_name": plugin_name},
+            )
 
     async def unload_plugin(self, plugin_name: str) -> None:
         """
@@ -221,6 +431,9 @@ class PluginLoader:
             await plugin.on_unload()
             del self.loaded_plugins[plugin_name]
             del self.plugin_manifests[plugin_name]
+            del self._plugin_contexts[plugin_name]
+            self._context_cache = None
+            self._context_cache_bytes = None
 
     async def unload_all_plugins(self) -> None:
         """Décharge tous les plugins."""
@@ -240,14 +453,14 @@ class PluginLoader:
         """
         return self.loaded_plugins.get(plugin_name)
 
-    def get_all_plugins(self) -> Dict[str, PluginInterface]:
+    def get_all_plugins(self) -> Mapping[str, PluginInterface]:
         """
         Récupère tous les plugins chargés.
 
         Returns:
-            Dictionnaire {nom: instance}
+            Vue en lecture seule {nom: instance} (appeler .copy() pour un dict)
         """
-        return self.loaded_plugins.copy()
+        return MappingProxyType(self.loaded_plugins)
 
     def get_plugin_manifest(self, plugin_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -265,17 +478,35 @@ class PluginLoader:
         """
         Récupère les contextes de tous les plugins pour le LLM.
 
+        Le contexte est construit une fois puis mis en cache jusqu'au
+        prochain chargement/déchargement de plugin.
+
         Returns:
             Contexte combiné de tous les plugins
         """
-        contexts = []
-        for plugin_name, plugin in self.loaded_plugins.items():
-            manifest = self.plugin_manifests[plugin_name]
-            contexts.append(f"## {manifest['description']}")
-            contexts.append(plugin.get_prompt_context())
-            contexts.append("")  # Ligne vide entre plugins
+        if self._context_cache is None:
+            # Ligne vide entre plugins, triés par nom: le prompt système
+            # reste identique d'un démarrage à l'autre
+            contexts = self._plugin_contexts
+            self._context_cache = "\n\n".join(
+                contexts[plugin_name] for plugin_name in sorted(contexts)
+            )
+
+        return self._context_cache
+
+    def get_all_plugin_contexts_bytes(self) -> bytes:
+        """
+        Récupère les contextes de tous les plugins encodés en UTF-8.
+
+        Encodé une seule fois et mis en cache avec le contexte texte.
+
+        Returns:
+            Contexte combiné de tous les plugins (UTF-8)
+        """
+        if self._context_cache_bytes is None:
+            self._context_cache_bytes = self.get_all_plugin_contexts().encode("utf-8")
 
-        return "\n".join(contexts)
+        return self._context_cache_bytes
 
     async def execute_plugin(
         self, plugin_name: str, intent: str, params: Dict[str, Any]
@@ -301,7 +532,6 @@ class PluginLoader:
                 plugin_name=plugin_name,
                 intent=intent,
                 message=f"Plugin '{plugin_name}' not loaded",
-                timestamp=datetime.utcnow(),
             )
 
         try:
@@ -317,22 +547,38 @@ class PluginLoader:
                     "error_type": type(e).__name__,
                     "params": params,
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def health_check_all(self) -> Dict[str, bool]:
         """
         Vérifie la santé de tous les plugins.
 
+        Les vérifications sont exécutées en parallèle.
+
         Returns:
             Dictionnaire {plugin_name: is_healthy}
         """
-        health_status = {}
-        for plugin_name, plugin in self.loaded_plugins.items():
-            try:
-                is_healthy = await plugin.health_check()
-                health_status[plugin_name] = is_healthy
-            except Exception:
-                health_status[plugin_name] = False
+        plugin_names = list(self.loaded_plugins.keys())
+        results = await asyncio.gather(
+            *(
+                self._safe_health_check(self.loaded_plugins[plugin_name])
+                for plugin_name in plugin_names
+            )
+        )
+
+        return dict(zip(plugin_names, results))
+
+    async def _safe_health_check(self, plugin: PluginInterface) -> bool:
+        """
+        Vérifie la santé d'un plugin sans propager les erreurs.
 
-        return health_status
+        Args:
+            plugin: Instance du plugin
+
+        Returns:
+            True si le plugin est sain, False en cas d'échec ou d'erreur
+        """
+        try:
+            return await plugin.health_check()
+        except Exception:
+            return False
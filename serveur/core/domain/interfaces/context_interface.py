@@ -10,12 +10,19 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # Dépendance optionnelle, repli sur la stdlib
+    parse_datetime = datetime.fromisoformat  # type: ignore[assignment]
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Message:
     """
     Message dans le contexte conversationnel.
 
+    Immuable et sans __dict__ (slots) pour limiter la mémoire par message.
+
     Attributes:
         role: Rôle du message ("user", "assistant", "system")
         content: Contenu du message
@@ -46,7 +53,7 @@ class Message:
         return cls(
             role=data["role"],
             content=data["content"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=parse_datetime(data["timestamp"]),
             client_id=data.get("client_id"),
             metadata=data.get("metadata"),
         )
@@ -4,16 +4,220 @@ Implémentation du wrapper LLM pour Phi-3 via llama-cpp-python.
 Utilise llama.cpp pour l'inférence CPU optimisée du modèle Phi-3-mini.
 """
 
-from typing import AsyncIterator, Optional, Dict, Any
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    FrozenSet,
+    Generator,
+    List,
+    Optional,
+    Dict,
+    Any,
+    Tuple,
+    cast,
+)
 from pathlib import Path
 import asyncio
+import logging
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-from llama_cpp import Llama
+try:
+    import ahocorasick
+except ImportError:  # Dépendance optionnelle, repli sur str.find
+    ahocorasick = None
+
+from llama_cpp import GGML_TYPE_F16, GGML_TYPE_Q4_0, GGML_TYPE_Q8_0, Llama
+from llama_cpp.llama_cache import LlamaRAMCache
 
 from core.domain.interfaces import LLMInterface, LLMResponse
 from shared.errors import LLMError, ModelLoadError
-from config import settings
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Marqueur de fin de génération dans la queue de streaming
+_STREAM_END = object()
+
+# Séquences de stop par défaut pour Phi-3 (liste: llama-cpp-python ignore
+# silencieusement un tuple passé en `stop`; ne jamais la muter)
+_DEFAULT_STOPS = ["<|end|>", "<|user|>"]
+
+# Nombre maximum de chunks en attente entre le thread de décodage et l'appelant
+_STREAM_QUEUE_SIZE = 64
+
+# Regroupement des tokens streamés: un yield dès ~16 caractères, ou au plus
+# tard 5 ms après le premier token du lot (moins de frames WebSocket)
+_STREAM_COALESCE_CHARS = 16
+_STREAM_COALESCE_SECONDS = 0.005
+
+# Valeurs GGUF "general.file_type" des poids non quantifiés (F32, F16, BF16)
+_UNQUANTIZED_FILE_TYPES = {0: "F32", 1: "F16", 32: "BF16"}
+
+# En-tête GGUF (v2+): magic, version, nombre de tenseurs, nombre de clés
+_GGUF_HEADER = struct.Struct("<4sIQQ")
+_GGUF_MAGIC = b"GGUF"
+_GGUF_FILE_TYPE_KEY = b"general.file_type"
+_GGUF_MAX_KEY_LENGTH = 65535
+
+# Types de valeurs des métadonnées GGUF: taille des scalaires en octets
+_GGUF_UINT32 = 4
+_GGUF_INT32 = 5
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+_GGUF_SCALAR_SIZES = {
+    0: 1,  # uint8
+    1: 1,  # int8
+    2: 2,  # uint16
+    3: 2,  # int16
+    4: 4,  # uint32
+    5: 4,  # int32
+    6: 4,  # float32
+    7: 1,  # bool
+    10: 8,  # uint64
+    11: 8,  # int64
+    12: 8,  # float64
+}
+
+# Types ggml du cache KV (K et V), selon settings.llm_kv_cache_type
+_KV_CACHE_TYPES = {
+    "f16": GGML_TYPE_F16,
+    "q8_0": GGML_TYPE_Q8_0,
+    "q4_0": GGML_TYPE_Q4_0,
+}
+
+# À partir de cette taille de contexte (fenêtre complète de Phi-3-mini-4k),
+# un cache KV f16 (~1,5 Go) domine la RAM et la bande passante lue à chaque token
+_LARGE_CONTEXT_TOKENS = 4096
+
+
+def _skip_gguf_value(f: BinaryIO, value_type: int) -> None:
+    """Saute une valeur de métadonnée GGUF sans la décoder."""
+    if value_type == _GGUF_STRING:
+        (length,) = struct.unpack("<Q", f.read(8))
+        f.seek(length, os.SEEK_CUR)
+    elif value_type == _GGUF_ARRAY:
+        item_type, count = struct.unpack("<IQ", f.read(12))
+        if item_type in _GGUF_SCALAR_SIZES:
+            f.seek(_GGUF_SCALAR_SIZES[item_type] * count, os.SEEK_CUR)
+        else:
+            for _ in range(count):
+                _skip_gguf_value(f, item_type)
+    else:
+        f.seek(_GGUF_SCALAR_SIZES[value_type], os.SEEK_CUR)
+
+
+def _read_gguf_file_type(path: str) -> Optional[int]:
+    """
+    Lit "general.file_type" dans l'en-tête GGUF, sans charger les poids.
+
+    Seules les métadonnées qui précèdent la clé sont parcourues; les
+    tableaux (vocabulaire du tokenizer) sont sautés sans être lus.
+
+    Args:
+        path: Chemin du fichier GGUF
+
+    Returns:
+        Type de fichier llama.cpp (ex: 15 = Q4_K_M), None si absent ou illisible
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, _, kv_count = _GGUF_HEADER.unpack(
+                f.read(_GGUF_HEADER.size)
+            )
+            if magic != _GGUF_MAGIC or version < 2:
+                return None
+
+            for _ in range(kv_count):
+                (key_length,) = struct.unpack("<Q", f.read(8))
+                if key_length > _GGUF_MAX_KEY_LENGTH:
+                    return None
+                key = f.read(key_length)
+                (value_type,) = struct.unpack("<I", f.read(4))
+                if key == _GGUF_FILE_TYPE_KEY and value_type == _GGUF_UINT32:
+                    return int(struct.unpack("<I", f.read(4))[0])
+                if key == _GGUF_FILE_TYPE_KEY and value_type == _GGUF_INT32:
+                    return int(struct.unpack("<i", f.read(4))[0])
+                _skip_gguf_value(f, value_type)
+    except (OSError, struct.error, KeyError):
+        return None
+
+    return None
+
+
+class _StopScanner:
+    """
+    Recherche des séquences de stop dans le texte streamé.
+
+    Les séquences sont compilées une fois en automate Aho-Corasick
+    (un seul parcours du texte quel que soit leur nombre), avec repli
+    sur str.find si pyahocorasick n'est pas installé.
+    """
+
+    def __init__(self, stops: Tuple[str, ...]):
+        """
+        Compile les séquences de stop.
+
+        Args:
+            stops: Séquences de stop (non vides)
+        """
+        self._stops = stops
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for stop in stops:
+                self._automaton.add_word(stop, len(stop))
+            self._automaton.make_automaton()
+
+        # Débuts stricts des séquences: un texte qui se termine par l'un
+        # d'eux peut encore former une séquence avec le chunk suivant
+        self._prefixes: FrozenSet[str] = frozenset(
+            stop[:i] for stop in stops for i in range(1, len(stop))
+        )
+        self._max_prefix = max((len(stop) for stop in stops), default=1) - 1
+
+    def find(self, text: str) -> int:
+        """
+        Retourne la position de la première séquence de stop, -1 sinon.
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Index du début de la première séquence trouvée, ou -1
+        """
+        if self._automaton is not None:
+            return min(
+                (end - length + 1 for end, length in self._automaton.iter(text)),
+                default=-1,
+            )
+        positions = [pos for pos in map(text.find, self._stops) if pos >= 0]
+        return min(positions, default=-1)
+
+    def holdback(self, text: str) -> int:
+        """
+        Longueur de la fin du texte à retenir avant de l'émettre.
+
+        Args:
+            text: Texte sans séquence de stop complète
+
+        Returns:
+            Longueur du plus long suffixe qui débute une séquence de stop
+        """
+        for length in range(min(self._max_prefix, len(text)), 0, -1):
+            if text[-length:] in self._prefixes:
+                return length
+        return 0
+
+
+@lru_cache(maxsize=32)
+def _get_stop_scanner(stops: Tuple[str, ...]) -> _StopScanner:
+    """Retourne le scanner compilé pour un jeu de séquences (trié)."""
+    return _StopScanner(stops)
 
 
 class Phi3Model(LLMInterface):
@@ -22,6 +226,10 @@ class Phi3Model(LLMInterface):
 
     Gère le chargement du modèle GGUF, la génération de texte
     avec streaming, et les optimisations CPU.
+
+    Quantification recommandée: Q4_K_M. Sur CPU, des poids F16/F32
+    sont nettement plus lents et occupent plusieurs fois plus de RAM;
+    un avertissement est émis au chargement dans ce cas.
     """
 
     def __init__(
@@ -30,6 +238,7 @@ class Phi3Model(LLMInterface):
         n_ctx: Optional[int] = None,
         n_threads: Optional[int] = None,
         n_gpu_layers: Optional[int] = None,
+        prompt_cache_bytes: Optional[int] = None,
     ):
         """
         Initialise le modèle Phi-3.
@@ -37,20 +246,42 @@ class Phi3Model(LLMInterface):
         Args:
             model_path: Chemin vers le fichier GGUF (défaut: depuis config)
             n_ctx: Taille de la fenêtre de contexte (défaut: depuis config)
-            n_threads: Nombre de threads CPU (défaut: depuis config)
+            n_threads: Nombre de threads CPU (défaut: depuis config,
+                sinon min(16, nombre de cœurs))
             n_gpu_layers: Nombre de couches GPU (défaut: 0, CPU-only)
+            prompt_cache_bytes: Taille du cache d'états KV (défaut: depuis config,
+                0 pour désactiver)
 
         Raises:
             ModelLoadError: Si le modèle ne peut pas être chargé
         """
-        self._model_path = model_path or settings.llm_model_path
-        self._n_ctx = n_ctx or settings.llm_context_size
-        self._n_threads = n_threads or settings.llm_n_threads
-        self._n_gpu_layers = n_gpu_layers or settings.llm_n_gpu_layers
+        # Configuration lue à la création (get_settings.cache_clear() pris
+        # en compte par les instances suivantes)
+        self._settings = get_settings()
+        self._model_path = model_path or self._settings.llm_model_path
+        self._n_ctx = n_ctx or self._settings.llm_context_size
+        self._n_threads = (
+            n_threads or self._settings.llm_n_threads or min(16, os.cpu_count() or 1)
+        )
+        self._n_gpu_layers = n_gpu_layers or self._settings.llm_n_gpu_layers
+        self._prompt_cache_bytes = (
+            prompt_cache_bytes
+            if prompt_cache_bytes is not None
+            else self._settings.llm_prompt_cache_bytes
+        )
 
         self._model: Optional[Llama] = None
         self._is_loaded = False
 
+        # llama.cpp n'est pas réentrant: un seul thread dédié exécute les
+        # appels au modèle, et le verrou sérialise les générations
+        self._llm_executor: Optional[ThreadPoolExecutor] = None
+        self._gen_lock = asyncio.Lock()
+
+        # Tokens du template Phi-3, calculés une fois au chargement
+        self._tok_user: List[int] = []
+        self._tok_end_assistant: List[int] = []
+
     async def _load_model(self) -> None:
         """
         Charge le modèle en mémoire.
@@ -63,6 +294,28 @@ class Phi3Model(LLMInterface):
         if self._is_loaded:
             return
 
+        async with self._gen_lock:
+            # Un autre appel a pu charger le modèle pendant l'attente du verrou
+            if self._is_loaded:
+                return
+            await self._load_model_locked()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retourne le thread dédié au modèle, recréé après un unload()."""
+        if self._llm_executor is None:
+            self._llm_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="phi3"
+            )
+        return self._llm_executor
+
+    async def _load_model_locked(self) -> None:
+        """
+        Charge le modèle, verrou de génération déjà acquis.
+
+        Raises:
+            ModelLoadError: Si le chargement échoue
+        """
+        file_type: Optional[int] = None
         try:
             # Vérifier que le fichier existe
             model_file = Path(self._model_path)
@@ -71,40 +324,152 @@ class Phi3Model(LLMInterface):
                     model_name="Phi-3-mini",
                     model_path=self._model_path,
                     message=f"Model file not found at {self._model_path}",
-                    timestamp=datetime.utcnow(),
+                    context={"preferred_quant": self._settings.llm_preferred_quant},
                 )
 
-            # Charger le modèle (opération bloquante, executer dans thread)
+            # Quantification lue dans l'en-tête, avant le chargement complet
             loop = asyncio.get_event_loop()
+            file_type = await loop.run_in_executor(
+                self._get_executor(), _read_gguf_file_type, self._model_path
+            )
+            self._warn_if_unquantized(file_type)
+
+            kv_cache_type = self._resolve_kv_cache_type()
+
+            # Charger le modèle (opération bloquante, executer dans thread)
             self._model = await loop.run_in_executor(
-                None,
+                self._get_executor(),
                 lambda: Llama(
                     model_path=self._model_path,
                     n_ctx=self._n_ctx,
+                    n_batch=self._settings.llm_n_batch,
+                    n_ubatch=self._settings.llm_n_ubatch,
                     n_threads=self._n_threads,
+                    n_threads_batch=self._n_threads,
                     n_gpu_layers=self._n_gpu_layers,
+                    use_mmap=True,
+                    use_mlock=self._settings.llm_use_mlock,
+                    # Logits du dernier token uniquement, pas de mode embedding
+                    logits_all=False,
+                    embedding=False,
+                    flash_attn=self._settings.llm_flash_attn,
+                    offload_kqv=True,
+                    type_k=kv_cache_type,
+                    type_v=kv_cache_type,
                     verbose=False,
                 ),
             )
 
+            # llama.cpp réutilise déjà le préfixe commun avec le dernier prompt
+            # évalué; le cache RAM conserve en plus les états KV des tours
+            # précédents pour ne re-préremplir que les nouveaux tokens.
+            # Opt-in: l'état est sauvegardé après chaque génération (KV +
+            # logits, hors budget du cache), coût perdu tant que les prompts
+            # (un seul tour) ne partagent pas de préfixe.
+            if self._prompt_cache_bytes > 0:
+                self._model.set_cache(
+                    LlamaRAMCache(capacity_bytes=self._prompt_cache_bytes)
+                )
+
+            # Pré-tokeniser les balises fixes du template (tokens spéciaux).
+            # Le "\n" qui suit <|user|> est tokenisé avec le message: avec
+            # un tokenizer SentencePiece, tokeniser le message seul lui
+            # ajouterait un espace initial ("▁Hello" au lieu de "Hello").
+            self._tok_user = self._model.tokenize(
+                b"<|user|>", add_bos=True, special=True
+            )
+            self._tok_end_assistant = self._model.tokenize(
+                b"<|end|>\n<|assistant|>\n", add_bos=False, special=True
+            )
+
             self._is_loaded = True
 
         except ModelLoadError:
             raise
         except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
+            # La traceback reste accessible via __cause__ pour le logging
             raise ModelLoadError(
                 model_name="Phi-3-mini",
                 model_path=self._model_path,
-                message=f"{str(e)}\n\nDetailed traceback:\n{error_details}",
-                context={"error_type": type(e).__name__},
-                timestamp=datetime.utcnow(),
+                message=str(e),
+                context={
+                    "error_type": type(e).__name__,
+                    "file_type": file_type,
+                    "preferred_quant": self._settings.llm_preferred_quant,
+                },
+            ) from e
+
+    def _resolve_kv_cache_type(self) -> int:
+        """
+        Détermine le type ggml du cache KV à partir de la configuration.
+
+        Le décodage CPU est limité par la bande passante mémoire: chaque
+        token relit tout le cache KV, qu'un type q8_0 divise par deux.
+        llama.cpp n'accepte un cache V quantifié qu'avec flash attention;
+        sans elle, le cache reste en f16.
+
+        Returns:
+            Type ggml à passer en type_k/type_v
+        """
+        kv_cache_type = self._settings.llm_kv_cache_type
+        if kv_cache_type != "f16" and not self._settings.llm_flash_attn:
+            logger.warning(
+                "KV cache type %s requires flash attention; falling back to f16",
+                kv_cache_type,
+                extra={"kv_cache_type": kv_cache_type},
             )
+            kv_cache_type = "f16"
+
+        if kv_cache_type == "f16" and self._n_ctx >= _LARGE_CONTEXT_TOKENS:
+            logger.warning(
+                "Context size %d with an f16 KV cache; set LLM_KV_CACHE_TYPE=q8_0 "
+                "to halve KV memory",
+                self._n_ctx,
+                extra={"n_ctx": self._n_ctx},
+            )
+
+        return _KV_CACHE_TYPES[kv_cache_type]
 
-    def _format_prompt(self, prompt: str) -> str:
+    def _warn_if_unquantized(self, file_type: Optional[int]) -> None:
         """
-        Formate le prompt selon le template Phi-3.
+        Avertit si le fichier GGUF contient des poids non quantifiés.
+
+        Args:
+            file_type: Valeur "general.file_type" de l'en-tête (None si inconnue)
+        """
+        if file_type in _UNQUANTIZED_FILE_TYPES:
+            logger.warning(
+                "Model %s uses unquantized %s weights; a %s GGUF is "
+                "recommended for CPU inference",
+                self._model_path,
+                _UNQUANTIZED_FILE_TYPES[file_type],
+                self._settings.llm_preferred_quant,
+                extra={
+                    "model_path": self._model_path,
+                    "file_type": file_type,
+                    "preferred_quant": self._settings.llm_preferred_quant,
+                },
+            )
+
+    def _require_model(self) -> Llama:
+        """
+        Retourne le modèle chargé, à appeler sur le thread du modèle.
+
+        Returns:
+            Instance Llama chargée
+
+        Raises:
+            LLMError: Si le modèle a été déchargé entre-temps
+        """
+        if self._model is None:
+            raise LLMError(
+                message="Model not loaded",
+            )
+        return self._model
+
+    def _format_prompt(self, prompt: str) -> List[int]:
+        """
+        Formate le prompt selon le template Phi-3, directement en tokens.
 
         Phi-3 utilise le format:
         <|system|>
@@ -113,15 +478,26 @@ class Phi3Model(LLMInterface):
         User message<|end|>
         <|assistant|>
 
+        Les balises sont pré-tokenisées au chargement: seul le message
+        (précédé du saut de ligne suivant <|user|>) est tokenisé, sans
+        interpréter d'éventuels tokens spéciaux qu'il contiendrait. Les
+        tokens obtenus sont ceux de la chaîne complète du template.
+
         Args:
             prompt: Prompt brut
 
         Returns:
-            Prompt formaté pour Phi-3
+            Tokens du prompt formaté pour Phi-3
         """
         # Pour l'instant, format simple
         # TODO: Gérer system prompt + historique conversationnel
-        return f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
+        return [
+            *self._tok_user,
+            *self._require_model().tokenize(
+                f"\n{prompt}".encode("utf-8"), add_bos=False
+            ),
+            *self._tok_end_assistant,
+        ]
 
     async def generate(
         self,
@@ -147,35 +523,33 @@ class Phi3Model(LLMInterface):
         """
         await self._load_model()
 
-        if not self._model:
-            raise LLMError(
-                message="Model not loaded",
-                timestamp=datetime.utcnow(),
-            )
-
         try:
-            formatted_prompt = self._format_prompt(prompt)
-
-            # Séquences de stop par défaut pour Phi-3
-            default_stops = ["<|end|>", "<|user|>"]
-            stops = list(set(default_stops + (stop_sequences or [])))
-
-            # Génération (opération bloquante)
-            loop = asyncio.get_event_loop()
-            start_time = datetime.utcnow()
+            # Séquences de stop: pas d'allocation sans séquences additionnelles
+            stops = (
+                [*_DEFAULT_STOPS, *stop_sequences] if stop_sequences else _DEFAULT_STOPS
+            )
 
-            output = await loop.run_in_executor(
-                None,
-                lambda: self._model(
-                    formatted_prompt,
+            def complete() -> Any:
+                # Vérification et tokenisation sur le thread du modèle, sous
+                # le verrou: un unload() concurrent ne peut pas s'intercaler.
+                # create_completion (et non __call__) est typé pour des tokens
+                model = self._require_model()
+                return model.create_completion(
+                    self._format_prompt(prompt),
                     max_tokens=max_tokens,
                     temperature=temperature,
                     stop=stops,
                     echo=False,
-                ),
-            )
+                )
+
+            # Génération (opération bloquante), une seule à la fois
+            loop = asyncio.get_event_loop()
+            async with self._gen_lock:
+                start_time = datetime.utcnow()
 
-            end_time = datetime.utcnow()
+                output = await loop.run_in_executor(self._get_executor(), complete)
+
+                end_time = datetime.utcnow()
             duration_ms = (end_time - start_time).total_seconds() * 1000
 
             # Extraire le texte généré
@@ -193,14 +567,18 @@ class Phi3Model(LLMInterface):
                 },
             )
 
+        except LLMError:
+            raise
         except Exception as e:
+            # Contexte construit seulement si l'erreur est sérialisée
+            # (e n'existe plus à la sortie du bloc except)
+            error_type = type(e).__name__
             raise LLMError(
                 message=f"Generation failed: {str(e)}",
-                context={
-                    "error_type": type(e).__name__,
+                context=lambda: {
+                    "error_type": error_type,
                     "prompt_length": len(prompt),
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def generate_streaming(
@@ -227,47 +605,140 @@ class Phi3Model(LLMInterface):
         """
         await self._load_model()
 
-        if not self._model:
-            raise LLMError(
-                message="Model not loaded",
-                timestamp=datetime.utcnow(),
-            )
-
         try:
-            formatted_prompt = self._format_prompt(prompt)
-
-            # Séquences de stop par défaut pour Phi-3
-            default_stops = ["<|end|>", "<|user|>"]
-            stops = list(set(default_stops + (stop_sequences or [])))
-
-            # Génération streaming
-            stream = self._model(
-                formatted_prompt,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                stop=stops,
-                echo=False,
-                stream=True,
+            # Séquences de stop: pas d'allocation sans séquences additionnelles
+            stops = (
+                [*_DEFAULT_STOPS, *stop_sequences] if stop_sequences else _DEFAULT_STOPS
             )
 
-            for output in stream:
-                if "choices" in output and len(output["choices"]) > 0:
-                    text = output["choices"][0].get("text", "")
-                    if text:
-                        yield text
-
-                    # Vérifier si la génération est terminée
-                    if output["choices"][0].get("finish_reason") is not None:
-                        break
-
+            # llama.cpp retient déjà les débuts de séquences de stop, mais
+            # le texte émis est revérifié ici avant d'atteindre le client
+            scanner = _get_stop_scanner(tuple(sorted(set(filter(None, stops)))))
+            pending = ""
+
+            # Le décodage (bloquant) tourne dans un thread et alimente une
+            # queue bornée: la boucle asyncio reste libre pendant la génération
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+            cancelled = threading.Event()
+
+            def publish(item: Any) -> None:
+                # Bloque le thread producteur si le consommateur est en retard
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+            def produce() -> None:
+                try:
+                    model = self._require_model()
+                    # stream=True renvoie un générateur (close() libère le décodage)
+                    stream = cast(
+                        Generator[Dict[str, Any], None, None],
+                        model.create_completion(
+                            self._format_prompt(prompt),
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                            stop=stops,
+                            echo=False,
+                            stream=True,
+                        ),
+                    )
+                    try:
+                        for output in stream:
+                            if cancelled.is_set():
+                                break
+                            if "choices" in output and len(output["choices"]) > 0:
+                                choice = output["choices"][0]
+                                text = choice.get("text", "")
+                                if text:
+                                    publish(text)
+
+                                # Vérifier si la génération est terminée
+                                if choice.get("finish_reason") is not None:
+                                    break
+                    finally:
+                        stream.close()
+                except Exception as e:
+                    if not cancelled.is_set():
+                        publish(e)
+                finally:
+                    if not cancelled.is_set():
+                        publish(_STREAM_END)
+
+            # Le verrou est tenu pendant tout le stream: llama.cpp ne voit
+            # jamais deux générations concurrentes
+            async with self._gen_lock:
+                producer = loop.run_in_executor(self._get_executor(), produce)
+
+                try:
+                    finished = False
+                    while not finished:
+                        # Regrouper les tokens en un seul yield, jusqu'au seuil
+                        # de taille ou à l'expiration de la fenêtre
+                        chunks = [await queue.get()]
+                        size = 0
+                        deadline = loop.time() + _STREAM_COALESCE_SECONDS
+                        while isinstance(chunks[-1], str):
+                            size += len(chunks[-1])
+                            if size >= _STREAM_COALESCE_CHARS:
+                                break
+                            if not queue.empty():
+                                chunks.append(queue.get_nowait())
+                                continue
+                            timeout = deadline - loop.time()
+                            if timeout <= 0:
+                                break
+                            try:
+                                chunks.append(
+                                    await asyncio.wait_for(queue.get(), timeout)
+                                )
+                            except asyncio.TimeoutError:
+                                break
+
+                        texts = []
+                        for chunk in chunks:
+                            if chunk is _STREAM_END:
+                                finished = True
+                            elif isinstance(chunk, Exception):
+                                raise chunk
+                            else:
+                                texts.append(chunk)
+
+                        if not texts:
+                            continue
+
+                        text = pending + "".join(texts)
+                        stop_at = scanner.find(text)
+                        if stop_at >= 0:
+                            # Séquence de stop complète: tronquer et arrêter
+                            text, pending = text[:stop_at], ""
+                            finished = True
+                        else:
+                            split_at = len(text) - scanner.holdback(text)
+                            text, pending = text[:split_at], text[split_at:]
+
+                        if text:
+                            yield text
+
+                    # Fin de génération: le texte retenu n'était pas un stop
+                    if pending:
+                        yield pending
+                finally:
+                    # Arrêt anticipé (client déconnecté, annulation): stopper le
+                    # décodage et débloquer le producteur avant de rendre la main
+                    cancelled.set()
+                    while not queue.empty():
+                        queue.get_nowait()
+                    await producer
+
+        except LLMError:
+            raise
         except Exception as e:
+            error_type = type(e).__name__
             raise LLMError(
                 message=f"Streaming generation failed: {str(e)}",
-                context={
-                    "error_type": type(e).__name__,
+                context=lambda: {
+                    "error_type": error_type,
                     "prompt_length": len(prompt),
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def is_loaded(self) -> bool:
@@ -285,10 +756,16 @@ class Phi3Model(LLMInterface):
 
         Utile pour libérer les ressources quand le modèle n'est plus utilisé.
         """
-        if self._model is not None:
-            # llama-cpp-python gère le nettoyage automatiquement
-            self._model = None
-            self._is_loaded = False
+        # Attendre la fin de la génération en cours avant de libérer le modèle
+        async with self._gen_lock:
+            if self._model is not None:
+                # llama-cpp-python gère le nettoyage automatiquement
+                self._model = None
+                self._is_loaded = False
+
+            if self._llm_executor is not None:
+                self._llm_executor.shutdown(wait=False)
+                self._llm_executor = None
 
     def get_context_size(self) -> int:
         """
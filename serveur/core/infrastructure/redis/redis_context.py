@@ -5,22 +5,130 @@ Gère le stockage et la récupération du contexte conversationnel
 partagé entre tous les clients via Redis.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from uuid import uuid4
+import calendar
 import json
+import logging
+import socket
 
+import msgpack
 import redis.asyncio as redis
 
 from core.domain.interfaces import ContextInterface, Message
 from shared.errors import ContextError, RedisError
-from config import settings
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Keepalive TCP agressif: détecte les connexions coupées par un NAT ou un
+# load-balancer avant qu'une commande n'échoue (options absentes hors Linux)
+_KEEPALIVE_OPTIONS = {
+    option: value
+    for option, value in (
+        (getattr(socket, "TCP_KEEPIDLE", None), 60),
+        (getattr(socket, "TCP_KEEPINTVL", None), 10),
+        (getattr(socket, "TCP_KEEPCNT", None), 3),
+    )
+    if option is not None
+}
+
+# Préfixe de version des messages encodés en MessagePack.
+# Les entrées sans préfixe sont des messages JSON (ancien format).
+_SCHEMA_VERSION = b"\x01"
+
+# Balises du template Phi-3 par rôle, utilisées par format_for_llm
+_ROLE_TAGS = {
+    "user": "<|user|>\n",
+    "assistant": "<|assistant|>\n",
+    "system": "<|system|>\n",
+}
+_END_TAG = "<|end|>\n"
+
+
+def _encode_message(message: Message) -> bytes:
+    """
+    Sérialise un message pour stockage dans Redis.
+
+    Args:
+        message: Message à sérialiser
+
+    Returns:
+        Octet de version suivi du message encodé en MessagePack
+    """
+    packed: bytes = msgpack.packb(message.to_dict(), use_bin_type=True)
+    return _SCHEMA_VERSION + packed
+
+
+def _decode_message(payload: bytes) -> Message:
+    """
+    Désérialise un message stocké dans Redis.
+
+    Accepte aussi les messages JSON de l'ancien format.
+
+    Args:
+        payload: Contenu brut de l'entrée Redis
+
+    Returns:
+        Message désérialisé
+    """
+    if payload[:1] == _SCHEMA_VERSION:
+        return Message.from_dict(msgpack.unpackb(payload[1:], raw=False))
+    return Message.from_dict(json.loads(payload))
+
+
+def _to_micros(moment: datetime) -> int:
+    """
+    Convertit une date en microsecondes depuis l'epoch.
+
+    Les dates naïves sont considérées en UTC (datetime.utcnow()).
+
+    Args:
+        moment: Date à convertir
+
+    Returns:
+        Nombre de microsecondes depuis l'epoch (UTC)
+    """
+    return calendar.timegm(moment.utctimetuple()) * 1_000_000 + moment.microsecond
+
+
+def _decode_messages(payloads: List[bytes]) -> Tuple[List[Message], int]:
+    """
+    Désérialise un lot de messages en ignorant les entrées corrompues.
+
+    Le lot est d'abord décodé sans gestion d'erreur par message; ce n'est
+    qu'en présence d'une entrée illisible qu'il est repris message par
+    message pour écarter les entrées corrompues.
+
+    Args:
+        payloads: Contenus bruts des entrées Redis, dans l'ordre
+
+    Returns:
+        Tuple (messages décodés, nombre d'entrées ignorées)
+    """
+    try:
+        return [_decode_message(payload) for payload in payloads], 0
+    except Exception:
+        pass
+
+    messages = []
+    for payload in payloads:
+        try:
+            messages.append(_decode_message(payload))
+        except Exception:
+            continue
+
+    return messages, len(payloads) - len(messages)
 
 
 class RedisContext(ContextInterface):
     """
     Implémentation Redis pour la gestion du contexte conversationnel.
 
-    Utilise une liste Redis pour stocker les messages avec TTL automatique.
+    Les messages sont stockés dans un hash (id -> message encodé) indexé
+    par un sorted set (score = timestamp), avec TTL automatique: lectures
+    et purges par date ou par nombre en O(log N + K).
     Tous les clients partagent le même contexte conversationnel.
     """
 
@@ -41,10 +149,15 @@ class RedisContext(ContextInterface):
         Raises:
             RedisError: Si la connexion Redis échoue
         """
-        self._redis_url = redis_url or settings.redis_url
-        self._ttl_seconds = ttl_seconds or settings.redis_ttl_seconds
+        self._settings = get_settings()
+        self._redis_url = redis_url or self._settings.redis_url
+        self._ttl_seconds = ttl_seconds or self._settings.redis_ttl_seconds
         self._key_prefix = key_prefix
-        self._messages_key = f"{key_prefix}:messages"
+        # Ancienne liste de messages, migrée à la connexion
+        self._legacy_list_key = f"{key_prefix}:messages"
+        self._migrating_key = f"{key_prefix}:messages:migrating"
+        self._messages_key = f"{key_prefix}:messages:data"
+        self._index_key = f"{key_prefix}:messages:index"
 
         # Connexion Redis (lazy, créée au premier appel)
         self._redis: Optional[redis.Redis] = None
@@ -61,24 +174,112 @@ class RedisContext(ContextInterface):
         """
         if self._redis is None:
             try:
-                self._redis = await redis.from_url(
+                client = await redis.from_url(
                     self._redis_url,
                     encoding="utf-8",
-                    decode_responses=True,
+                    decode_responses=False,
+                    max_connections=self._settings.redis_max_connections,
+                    socket_keepalive=True,
+                    socket_keepalive_options=_KEEPALIVE_OPTIONS,
+                    health_check_interval=self._settings.redis_health_check_interval,
+                    retry_on_timeout=True,
+                    client_name="hivemind",
                 )
                 # Test de la connexion
-                await self._redis.ping()
+                await client.ping()
 
             except Exception as e:
                 raise RedisError(
                     message=f"Failed to connect to Redis: {str(e)}",
                     operation="connect",
                     context={"redis_url": self._redis_url},
-                    timestamp=datetime.utcnow(),
                 )
 
+            # Connexion conservée seulement après la migration: en cas
+            # d'échec, l'appel suivant retente la migration
+            try:
+                await self._migrate_legacy_list(client)
+            except Exception as e:
+                await client.aclose()
+                raise RedisError(
+                    message=f"Failed to migrate legacy context list: {str(e)}",
+                    operation="migrate",
+                    context={"key": self._legacy_list_key},
+                )
+
+            self._redis = client
+
         return self._redis
 
+    async def _migrate_legacy_list(self, r: redis.Redis) -> None:
+        """
+        Migre l'ancienne liste Redis de messages vers le hash indexé.
+
+        La liste est d'abord renommée (RENAMENX, atomique) vers une clé
+        temporaire: un seul processus la récupère, et un RPUSH d'une
+        ancienne version arrivé ensuite recrée une liste migrée au prochain
+        démarrage. Les identifiants des messages migrés dépendent de leur
+        position: reprendre une migration interrompue (clé temporaire
+        restante) ou migrer la même liste deux fois ne crée pas de doublon.
+
+        Sans effet si la liste n'existe pas. Les entrées illisibles sont
+        abandonnées.
+
+        Args:
+            r: Connexion Redis
+        """
+        if await r.type(self._legacy_list_key) == b"list":
+            try:
+                # Sans effet si une migration interrompue a laissé la clé
+                # temporaire: elle est reprise ci-dessous
+                await r.renamenx(self._legacy_list_key, self._migrating_key)
+            except redis.ResponseError:
+                # Liste renommée entre-temps par un autre processus
+                pass
+
+        # Vide si la clé n'existe pas ou a déjà été migrée
+        payloads = await r.lrange(self._migrating_key, 0, -1)
+        if not payloads:
+            return
+
+        messages, dropped = _decode_messages(payloads)
+
+        async with r.pipeline(transaction=True) as pipe:
+            for index, message in enumerate(messages):
+                micros = _to_micros(message.timestamp)
+                self._queue_message(
+                    pipe, message, f"{micros * 1000}:legacy{index:08d}"
+                )
+            pipe.delete(self._migrating_key)
+            pipe.expire(self._messages_key, self._ttl_seconds)
+            pipe.expire(self._index_key, self._ttl_seconds)
+            await pipe.execute()
+
+        logger.info(
+            "Migrated %d context message(s) from legacy list (%d dropped)",
+            len(messages),
+            dropped,
+            extra={"key": self._legacy_list_key},
+        )
+
+    def _queue_message(
+        self, pipe: Any, message: Message, message_id: Optional[str] = None
+    ) -> None:
+        """
+        Ajoute à un pipeline l'écriture d'un message (HSET + ZADD).
+
+        Args:
+            pipe: Pipeline Redis
+            message: Message à stocker
+            message_id: Identifiant imposé (défaut: généré)
+        """
+        micros = _to_micros(message.timestamp)
+        if message_id is None:
+            # Identifiant triable par date, unique même à timestamp égal
+            message_id = f"{micros * 1000}:{uuid4().hex[:8]}"
+        pipe.hset(self._messages_key, message_id, _encode_message(message))
+        pipe.zadd(self._index_key, {message_id: micros / 1_000_000})
+
     async def add_message(
         self,
         role: str,
@@ -110,26 +311,27 @@ class RedisContext(ContextInterface):
                 metadata=metadata,
             )
 
-            # Sérialiser en JSON
-            message_json = json.dumps(message.to_dict())
-
-            # Ajouter à la liste Redis (RPUSH = append à droite)
-            await r.rpush(self._messages_key, message_json)
-
-            # Définir le TTL sur la clé (renouvelle à chaque ajout)
-            await r.expire(self._messages_key, self._ttl_seconds)
+            # Un seul aller-retour réseau pour HSET + ZADD + EXPIRE
+            async with r.pipeline(transaction=False) as pipe:
+                self._queue_message(pipe, message)
+                # Définir le TTL sur les clés (renouvelé à chaque ajout)
+                pipe.expire(self._messages_key, self._ttl_seconds)
+                pipe.expire(self._index_key, self._ttl_seconds)
+                await pipe.execute()
 
         except RedisError:
             raise
         except Exception as e:
+            # Contexte construit seulement si l'erreur est sérialisée
+            # (e n'existe plus à la sortie du bloc except)
+            error_type = type(e).__name__
             raise ContextError(
                 message=f"Failed to add message: {str(e)}",
-                context={
+                context=lambda: {
                     "role": role,
                     "content_length": len(content),
-                    "error_type": type(e).__name__,
+                    "error_type": error_type,
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def get_messages(
@@ -153,25 +355,49 @@ class RedisContext(ContextInterface):
         try:
             r = await self._get_redis()
 
-            # Récupérer tous les messages (LRANGE 0 -1 = toute la liste)
-            messages_json = await r.lrange(self._messages_key, 0, -1)
+            # Sélectionner les identifiants dans l'index (du plus ancien au
+            # plus récent), en ne lisant que les N derniers si limité
+            count = limit if limit is not None and limit > 0 else 0
+            if since:
+                min_score = _to_micros(since) / 1_000_000
+                if count:
+                    message_ids = await r.zrevrangebyscore(
+                        self._index_key, "+inf", min_score, start=0, num=count
+                    )
+                    message_ids.reverse()
+                else:
+                    message_ids = await r.zrangebyscore(
+                        self._index_key, min_score, "+inf"
+                    )
+            elif count:
+                message_ids = await r.zrevrange(self._index_key, 0, count - 1)
+                message_ids.reverse()
+            else:
+                message_ids = await r.zrange(self._index_key, 0, -1)
+
+            if not message_ids:
+                return []
+
+            # Entrées absentes: supprimées entre la lecture de l'index et HMGET
+            payloads = [
+                payload
+                for payload in await r.hmget(self._messages_key, message_ids)
+                if payload is not None
+            ]
 
             # Désérialiser les messages
-            messages = []
-            for msg_json in messages_json:
-                try:
-                    msg_dict = json.loads(msg_json)
-                    message = Message.from_dict(msg_dict)
-
-                    # Filtrer par date si spécifié
-                    if since and message.timestamp < since:
-                        continue
-
-                    messages.append(message)
-                except Exception as e:
-                    # Log l'erreur mais continue (message corrompu)
-                    print(f"Warning: Failed to parse message: {e}")
-                    continue
+            messages, dropped = _decode_messages(payloads)
+            if dropped:
+                # Log l'erreur mais continue (messages corrompus)
+                logger.warning(
+                    "Failed to parse %d context message(s)",
+                    dropped,
+                    extra={"dropped": dropped, "key": self._messages_key},
+                )
+
+            # Filtrer par date si spécifié
+            if since:
+                messages = [m for m in messages if m.timestamp >= since]
 
             # Appliquer la limite (prendre les N derniers messages)
             if limit and limit > 0:
@@ -188,7 +414,6 @@ class RedisContext(ContextInterface):
                     "limit": limit,
                     "error_type": type(e).__name__,
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def clear_context(self) -> None:
@@ -202,7 +427,7 @@ class RedisContext(ContextInterface):
         """
         try:
             r = await self._get_redis()
-            await r.delete(self._messages_key)
+            await r.delete(self._messages_key, self._index_key)
 
         except RedisError:
             raise
@@ -210,7 +435,6 @@ class RedisContext(ContextInterface):
             raise ContextError(
                 message=f"Failed to clear context: {str(e)}",
                 context={"error_type": type(e).__name__},
-                timestamp=datetime.utcnow(),
             )
 
     async def get_context_size(self) -> int:
@@ -225,7 +449,7 @@ class RedisContext(ContextInterface):
         """
         try:
             r = await self._get_redis()
-            size = await r.llen(self._messages_key)
+            size = await r.zcard(self._index_key)
             return size
 
         except RedisError:
@@ -234,7 +458,6 @@ class RedisContext(ContextInterface):
             raise ContextError(
                 message=f"Failed to get context size: {str(e)}",
                 context={"error_type": type(e).__name__},
-                timestamp=datetime.utcnow(),
             )
 
     async def prune_old_messages(self, before: datetime) -> int:
@@ -253,37 +476,28 @@ class RedisContext(ContextInterface):
         try:
             r = await self._get_redis()
 
-            # Récupérer tous les messages
-            messages = await self.get_messages()
-
-            # Filtrer les messages à conserver
-            messages_to_keep = [
-                msg for msg in messages if msg.timestamp >= before
-            ]
-
-            # Reconstruire la liste
-            await r.delete(self._messages_key)
+            # Messages strictement antérieurs à la date, via l'index
+            max_score = f"({_to_micros(before) / 1_000_000!r}"
+            message_ids = await r.zrangebyscore(self._index_key, "-inf", max_score)
 
-            if messages_to_keep:
-                messages_json = [
-                    json.dumps(msg.to_dict()) for msg in messages_to_keep
-                ]
-                await r.rpush(self._messages_key, *messages_json)
-                await r.expire(self._messages_key, self._ttl_seconds)
+            if message_ids:
+                async with r.pipeline(transaction=False) as pipe:
+                    pipe.hdel(self._messages_key, *message_ids)
+                    pipe.zrem(self._index_key, *message_ids)
+                    await pipe.execute()
 
-            deleted_count = len(messages) - len(messages_to_keep)
-            return deleted_count
+            return len(message_ids)
 
         except (RedisError, ContextError):
             raise
         except Exception as e:
+            error_type = type(e).__name__
             raise ContextError(
                 message=f"Failed to prune old messages: {str(e)}",
-                context={
+                context=lambda: {
                     "before": before.isoformat(),
-                    "error_type": type(e).__name__,
+                    "error_type": error_type,
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def format_for_llm(
@@ -307,26 +521,28 @@ class RedisContext(ContextInterface):
         try:
             messages = await self.get_messages(limit=limit)
 
-            # Construire le prompt
-            lines = []
+            # Construire le prompt en une seule concaténation
+            parts: List[str] = []
+            append = parts.append
 
             # Ajouter le system prompt si fourni
             if system_prompt:
-                lines.append(f"<|system|>\n{system_prompt}<|end|>")
+                append(_ROLE_TAGS["system"])
+                append(system_prompt)
+                append(_END_TAG)
 
-            # Ajouter les messages
+            # Ajouter les messages (rôles inconnus ignorés)
             for msg in messages:
-                if msg.role == "user":
-                    lines.append(f"<|user|>\n{msg.content}<|end|>")
-                elif msg.role == "assistant":
-                    lines.append(f"<|assistant|>\n{msg.content}<|end|>")
-                elif msg.role == "system":
-                    lines.append(f"<|system|>\n{msg.content}<|end|>")
+                tag = _ROLE_TAGS.get(msg.role)
+                if tag:
+                    append(tag)
+                    append(msg.content)
+                    append(_END_TAG)
 
             # Ajouter le tag d'assistant pour déclencher la génération
-            lines.append("<|assistant|>")
+            append("<|assistant|>")
 
-            return "\n".join(lines)
+            return "".join(parts)
 
         except (RedisError, ContextError):
             raise
@@ -337,7 +553,6 @@ class RedisContext(ContextInterface):
                     "limit": limit,
                     "error_type": type(e).__name__,
                 },
-                timestamp=datetime.utcnow(),
             )
 
     async def close(self) -> None:
@@ -0,0 +1,47 @@
+"""
+Point d'entrée FastAPI du serveur Hive Mind.
+
+Lance l'application avec `python main.py` (développement) ou via uvicorn.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import uvicorn
+from fastapi import FastAPI
+
+from config import get_settings
+from shared.logging import configure_logging
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Cycle de vie du serveur: logging au démarrage, arrêt propre.
+
+    Le QueueListener est arrêté en dernier pour vider les enregistrements
+    émis pendant l'arrêt des autres composants.
+
+    Args:
+        app: Application FastAPI
+    """
+    listener = configure_logging()
+    try:
+        yield
+    finally:
+        listener.stop()
+
+
+app = FastAPI(title="Hive Mind", lifespan=lifespan)
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    # log_config=None: les loggers d'uvicorn passent par le QueueHandler racine
+    uvicorn.run(
+        "main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        reload=settings.is_development,
+        log_config=None,
+    )
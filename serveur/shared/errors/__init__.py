@@ -23,6 +23,7 @@ Usage:
 
 # Base errors
 from shared.errors.base import BaseError
+from shared.errors.codes import ErrorCode
 
 # Domain errors
 from shared.errors.domain import (
@@ -48,6 +49,7 @@ from shared.errors.infrastructure import (
 __all__ = [
     # Base
     "BaseError",
+    "ErrorCode",
     # Domain
     "DomainError",
     "ValidationError",
@@ -0,0 +1,32 @@
+"""
+Horloge à résolution grossière pour l'horodatage des erreurs.
+
+Construire un datetime à chaque erreur levée coûte plus cher que
+l'erreur elle-même; une milliseconde de précision suffit au logging.
+"""
+
+from datetime import datetime, timezone
+import time
+
+# Résolution de l'horloge (nanosecondes)
+_RESOLUTION_NS = 1_000_000
+
+# Dernière lecture: (time.monotonic_ns(), datetime UTC correspondant).
+# Remplacé d'un bloc: la lecture reste cohérente entre threads.
+_last_reading = (-_RESOLUTION_NS, datetime.now(timezone.utc))
+
+
+def now_utc() -> datetime:
+    """
+    Retourne l'instant courant en UTC (timezone-aware), à 1 ms près.
+
+    Returns:
+        Datetime UTC, réutilisé pour tous les appels d'une même milliseconde
+    """
+    global _last_reading
+    monotonic_ns, moment = _last_reading
+    current_ns = time.monotonic_ns()
+    if current_ns - monotonic_ns >= _RESOLUTION_NS:
+        moment = datetime.now(timezone.utc)
+        _last_reading = (current_ns, moment)
+    return moment
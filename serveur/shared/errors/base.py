@@ -4,12 +4,76 @@ Erreurs de base pour Hive Mind.
 Définit la hiérarchie d'erreurs selon les principes Clean Architecture.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, ClassVar, Mapping, Tuple, Type, Union
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+
+from shared.errors._clock import now_utc
+from shared.errors.codes import ErrorCode
+
+
+# Contexte d'erreur: dict, ou fabrique appelée seulement à la sérialisation
+ErrorContext = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+# Contexte pas encore construit (None est une valeur valide)
+_UNRESOLVED = object()
+
+# Contexte vide partagé (lecture seule) des erreurs sans contexte
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+
+@lru_cache(maxsize=256, typed=True)
+def _memoized_format(template: str, *args: Any) -> str:
+    """Formate un template `%` (clé de cache typée: 1 et True sont distincts)."""
+    return template % args
+
+
+def cached_format(template: str, *args: Any) -> str:
+    """
+    Formate un message d'erreur en mémoïsant le résultat.
+
+    Une même erreur (même champ, même message) levée en boucle, par
+    exemple par un client qui renvoie la même requête invalide, ne
+    reformate pas son message et partage la même chaîne. Les valeurs
+    non hashables (listes, dicts...) sont formatées sans cache.
+
+    Args:
+        template: Template `%` de la classe d'erreur
+        *args: Valeurs à insérer
+
+    Returns:
+        Message formaté
+    """
+    try:
+        return _memoized_format(template, *args)
+    except TypeError:
+        # Clé de cache non hashable
+        return template % args
+
+
+def _restore_error(
+    cls: Type["BaseError"], args: Tuple[Any, ...], state: Dict[str, Any]
+) -> "BaseError":
+    """
+    Recrée une erreur dépicklée sans rappeler son constructeur.
+
+    Args:
+        cls: Classe de l'erreur
+        args: Champs bruts de l'erreur (voir BaseError.args)
+        state: Valeurs des slots
+
+    Returns:
+        Erreur reconstruite
+    """
+    error = cls.__new__(cls)
+    error.args = args
+    for name, value in state.items():
+        setattr(error, name, value)
+    return error
 
 
-@dataclass
 class BaseError(Exception):
     """
     Erreur de base pour toutes les erreurs Hive Mind.
@@ -17,30 +81,173 @@ class BaseError(Exception):
     Toutes les erreurs personnalisées doivent hériter de cette classe.
     Fournit une structure commune pour le logging et le debugging.
 
+    Les sous-classes qui composent leur message à partir de plusieurs
+    champs passent message=None et surchargent _format_message(): le
+    message n'est construit qu'au premier accès (str(), to_dict(), logging),
+    jamais pour une erreur levée puis ignorée. De même, les champs de
+    contexte propres à une sous-classe (_own_context()) ne sont fusionnés
+    avec le contexte de l'appelant qu'au premier accès à `context`.
+
+    `args` contient les champs bruts passés à l'erreur, par exemple
+    (field, message) pour ValidationError, et non le message composé:
+    un except qui ignore l'erreur ne paie jamais sa mise en forme.
+
+    Les sous-classes appellent BaseError.__init__ directement, avec des
+    arguments positionnels: pas de résolution super() ni de dict de kwargs
+    à chaque erreur levée. Les erreurs simples (message + contexte)
+    héritent de SimpleError et déclarent seulement leur code:
+
+        class LLMError(DomainError, SimpleError):
+            __slots__ = ()
+            _ERROR_CODE = ErrorCode.LLM_ERROR
+
     Attributes:
         message: Message d'erreur lisible
-        error_code: Code d'erreur unique pour identification
+        error_code: Code d'erreur unique pour identification (ErrorCode pour
+            les erreurs Hive Mind, string accepté pour les plugins)
         timestamp: Timestamp de l'erreur
-        context: Contexte additionnel (optionnel)
+        context: Contexte complet (champs propres à l'erreur + contexte de
+            l'appelant), construit au premier accès; None si l'erreur n'en a
+            pas (voir context_or_empty)
     """
 
-    message: str
-    error_code: str
-    timestamp: datetime = field(default_factory=datetime.utcnow)
-    context: Optional[Dict[str, Any]] = None
+    # Pas de __dict__ matérialisé par instance (attributs en slots)
+    __slots__ = (
+        "_message",
+        "error_code",
+        "timestamp",
+        "_context_extra",
+        "_context",
+        "_cached_dict",
+    )
+
+    # Code des erreurs simples (voir SimpleError)
+    _ERROR_CODE: ClassVar[ErrorCode]
+
+    def __init__(
+        self,
+        message: Optional[str],
+        error_code: Union[ErrorCode, str],
+        timestamp: Optional[datetime] = None,
+        context: Optional[ErrorContext] = None,
+    ):
+        """
+        Initialise l'erreur.
+
+        Args:
+            message: Message d'erreur, ou None si construit par _format_message()
+            error_code: Code d'erreur unique
+            timestamp: Timestamp de l'erreur (défaut: maintenant, UTC)
+            context: Contexte additionnel (dict, ou fabrique sans argument
+                évaluée seulement au premier accès)
+        """
+        # Les sous-classes à message composé fixent `args` elles-mêmes
+        if message is not None:
+            Exception.__init__(self, message)
+        self._message = message
+        self.error_code = error_code
+        self.timestamp = timestamp if timestamp is not None else now_utc()
+        self._context_extra = context
+        self._context: Any = _UNRESOLVED
+        self._cached_dict: Optional[Dict[str, Any]] = None
+
+    @property
+    def message(self) -> str:
+        """Message d'erreur, construit au premier accès."""
+        if self._message is None:
+            self._message = self._format_message()
+        return self._message
+
+    def _format_message(self) -> str:
+        """
+        Construit le message des erreurs créées avec message=None.
+
+        Returns:
+            Message d'erreur complet
+        """
+        return ""
+
+    @property
+    def context(self) -> Optional[Dict[str, Any]]:
+        """Contexte complet de l'erreur, construit au premier accès."""
+        if self._context is _UNRESOLVED:
+            extra = self._context_extra
+            if callable(extra):
+                extra = extra()
+            context = self._own_context()
+            if context is None:
+                context = extra
+            elif extra:
+                context.update(extra)
+            self._context = context
+        resolved: Optional[Dict[str, Any]] = self._context
+        return resolved
+
+    @property
+    def context_or_empty(self) -> Mapping[str, Any]:
+        """
+        Contexte de l'erreur, ou un mapping vide partagé s'il n'y en a pas.
+
+        Permet de lire le contexte sans tester None ni allouer de dict.
+        """
+        context = self.context
+        return _EMPTY_CONTEXT if context is None else context
+
+    def _own_context(self) -> Optional[Dict[str, Any]]:
+        """
+        Construit les champs de contexte propres à la sous-classe.
+
+        Returns:
+            Nouveau dict de contexte, ou None si l'erreur n'en a pas
+        """
+        return None
+
+    @property
+    def code_str(self) -> str:
+        """Code d'erreur sous forme sérialisable (ex: "VALIDATION_ERROR")."""
+        error_code = self.error_code
+        return error_code.name if isinstance(error_code, ErrorCode) else error_code
 
     def __str__(self) -> str:
         """Retourne une représentation string de l'erreur."""
-        return f"[{self.error_code}] {self.message}"
+        return f"[{self.code_str}] {self.message}"
+
+    def __repr__(self) -> str:
+        """Retourne une représentation de debug de l'erreur."""
+        return (
+            f"{self.__class__.__name__}(message={self.message!r}, "
+            f"error_code={self.code_str!r}, timestamp={self.timestamp!r}, "
+            f"context={self.context!r})"
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Sérialise l'erreur pour pickle (multiprocessing, files de tâches).
+
+        Les constructeurs des sous-classes ne correspondent pas à `args`:
+        l'erreur est recréée à partir de ses slots. Le contexte est résolu
+        avant (une fabrique lambda n'est pas picklable).
 
-    def __post_init__(self) -> None:
-        """Initialise l'exception après création du dataclass."""
-        super().__init__(self.message)
+        Returns:
+            Fonction de reconstruction et ses arguments
+        """
+        _ = self.context  # résout la fabrique de contexte avant pickle
+        state: Dict[str, Any] = {}
+        for klass in type(self).__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state["_context_extra"] = None
+        state["_cached_dict"] = None
+        return (_restore_error, (type(self), self.args, state))
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Sérialise l'erreur en dictionnaire pour logging.
 
+        Le dictionnaire est construit au premier appel puis réutilisé:
+        il ne doit pas être modifié par l'appelant.
+
         Returns:
             Dict contenant toutes les informations de l'erreur
 
@@ -54,10 +261,38 @@ class BaseError(Exception):
                 'context': {}
             }
         """
-        return {
-            "error_code": self.error_code,
-            "message": self.message,
-            "timestamp": self.timestamp.isoformat(),
-            "context": self.context or {},
-            "error_type": self.__class__.__name__,
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "error_code": self.code_str,
+                "message": self.message,
+                "timestamp": self.timestamp.isoformat(),
+                "context": self.context or {},
+                "error_type": self.__class__.__name__,
+            }
+        return self._cached_dict
+
+
+class SimpleError(BaseError):
+    """
+    Erreur simple (message + contexte) dont le code est fixé par la classe.
+
+    Les sous-classes déclarent seulement _ERROR_CODE.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        message: str,
+        context: Optional[ErrorContext] = None,
+        timestamp: Optional[datetime] = None,
+    ):
+        """
+        Initialise l'erreur avec le code déclaré par sa classe.
+
+        Args:
+            message: Description de l'erreur
+            context: Contexte additionnel (optionnel)
+            timestamp: Timestamp personnalisé (optionnel)
+        """
+        BaseError.__init__(self, message, self._ERROR_CODE, timestamp, context)
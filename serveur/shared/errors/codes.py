@@ -0,0 +1,33 @@
+"""
+Codes d'erreur de Hive Mind.
+
+Chaque erreur porte un ErrorCode: les consommateurs comparent des
+entiers, et le nom du membre reste la représentation sérialisée.
+"""
+
+from enum import IntEnum
+
+
+class ErrorCode(IntEnum):
+    """
+    Codes des erreurs Hive Mind.
+
+    Le nom de chaque membre est le code sérialisé (to_dict, str()),
+    identique aux anciens codes string.
+
+    Examples:
+        >>> ErrorCode.VALIDATION_ERROR.name
+        'VALIDATION_ERROR'
+    """
+
+    VALIDATION_ERROR = 1
+    AUDIO_PROCESSING_ERROR = 2
+    LLM_ERROR = 3
+    PLUGIN_EXECUTION_ERROR = 4
+    CONTEXT_ERROR = 5
+    DATABASE_ERROR = 6
+    REDIS_ERROR = 7
+    EXTERNAL_API_ERROR = 8
+    NETWORK_ERROR = 9
+    CONFIGURATION_ERROR = 10
+    MODEL_LOAD_ERROR = 11
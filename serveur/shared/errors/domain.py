@@ -5,15 +5,52 @@ Ces erreurs représentent des violations de règles métier
 ou des états invalides dans le domaine.
 """
 
+from __future__ import annotations
+
 from datetime import datetime
-from typing import Optional, Dict, Any
-from shared.errors.base import BaseError
+from functools import lru_cache
+import threading
+from typing import Optional, Dict, Any, List, Type
+from shared.errors.base import BaseError, ErrorContext, SimpleError, cached_format
+from shared.errors.codes import ErrorCode
+
+# Instances de ValidationError libérées, par thread et par classe
+_VALIDATION_POOL = threading.local()
+_VALIDATION_POOL_SIZE = 16
+
+
+def _validation_free_list(cls: Type[ValidationError]) -> List[ValidationError]:
+    """Retourne la liste des instances libres de `cls` du thread courant."""
+    free_lists: Dict[Type[ValidationError], List[ValidationError]]
+    try:
+        free_lists = _VALIDATION_POOL.free_lists
+    except AttributeError:
+        free_lists = _VALIDATION_POOL.free_lists = {}
+    return free_lists.setdefault(cls, [])
+
+
+@lru_cache(maxsize=128)
+def _plugin_prefix(plugin_name: str, intent: str) -> str:
+    """
+    Construit le préfixe des messages d'erreur d'un couple (plugin, intent).
+
+    Un plugin en panne échoue en boucle sur les mêmes intents: le préfixe
+    est calculé une fois puis partagé.
+
+    Args:
+        plugin_name: Nom du plugin en erreur
+        intent: Intent qui a échoué
+
+    Returns:
+        Préfixe du message, espace final compris
+    """
+    return f"Plugin '{plugin_name}' failed to execute intent '{intent}': "
 
 
 class DomainError(BaseError):
     """Erreur métier générique."""
 
-    pass
+    __slots__ = ()
 
 
 class ValidationError(DomainError):
@@ -23,11 +60,15 @@ class ValidationError(DomainError):
     Levée quand des données ne respectent pas les contraintes métier.
     """
 
+    __slots__ = ("_field", "_raw_message")
+
+    _FMT = "Validation failed for '%s': %s"
+
     def __init__(
         self,
         field: str,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -39,45 +80,81 @@ class ValidationError(DomainError):
             context: Contexte additionnel (optionnel)
             timestamp: Timestamp personnalisé (optionnel)
         """
-        full_message = f"Validation failed for '{field}': {message}"
-        super().__init__(
-            message=full_message,
-            error_code="VALIDATION_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={"field": field, **(context or {})},
-        )
+        BaseError.__init__(self, None, ErrorCode.VALIDATION_ERROR, timestamp, context)
+        self._field = field
+        self._raw_message = message
+        self.args = (field, message)
+
+    @classmethod
+    def build(
+        cls,
+        field: str,
+        message: str,
+        context: Optional[ErrorContext] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> ValidationError:
+        """
+        Crée une erreur de validation en réutilisant une instance libérée.
 
+        Réservé aux chemins de validation internes à fort volume:
+        l'appelant doit appeler release() une fois l'erreur traitée et
+        ne plus la référencer ensuite (ni la stocker, ni la re-lever).
 
-class AudioProcessingError(DomainError):
+        Args:
+            field: Nom du champ en erreur
+            message: Description de l'erreur de validation
+            context: Contexte additionnel (optionnel)
+            timestamp: Timestamp personnalisé (optionnel)
+
+        Returns:
+            Erreur de validation prête à être levée
+        """
+        free = _validation_free_list(cls)
+        if not free:
+            return cls(field, message, context, timestamp)
+
+        error = free.pop()
+        cls.__init__(error, field, message, context, timestamp)
+        return error
+
+    def release(self) -> None:
+        """
+        Rend l'instance au pool du thread courant (voir build()).
+
+        L'instance ne doit plus être utilisée après cet appel.
+        """
+        free = _validation_free_list(type(self))
+        if len(free) < _VALIDATION_POOL_SIZE:
+            # Ne pas retenir la pile d'appels, les exceptions chaînées
+            # ni les notes (add_note) de l'utilisation précédente
+            self.__traceback__ = None
+            self.__cause__ = None
+            self.__context__ = None
+            self.__suppress_context__ = False
+            self.__dict__.pop("__notes__", None)
+            free.append(self)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre à l'erreur de validation."""
+        return {"field": self._field}
+
+    def _format_message(self) -> str:
+        """Construit le message complet à partir du champ en erreur."""
+        return cached_format(self._FMT, self._field, self._raw_message)
+
+
+class AudioProcessingError(DomainError, SimpleError):
     """
     Erreur lors du traitement audio.
 
     Levée quand l'audio est corrompu, invalide ou non processable.
     """
 
-    def __init__(
-        self,
-        message: str,
-        context: Optional[Dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
-    ):
-        """
-        Initialise une erreur de traitement audio.
-
-        Args:
-            message: Description de l'erreur
-            context: Contexte additionnel (ex: format, taille)
-            timestamp: Timestamp personnalisé (optionnel)
-        """
-        super().__init__(
-            message=message,
-            error_code="AUDIO_PROCESSING_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context=context,
-        )
+    __slots__ = ()
+    _ERROR_CODE = ErrorCode.AUDIO_PROCESSING_ERROR
 
 
-class LLMError(DomainError):
+class LLMError(DomainError, SimpleError):
     """
     Erreur lors de l'utilisation du LLM.
 
@@ -85,26 +162,8 @@ class LLMError(DomainError):
     ou rencontre une erreur interne.
     """
 
-    def __init__(
-        self,
-        message: str,
-        context: Optional[Dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
-    ):
-        """
-        Initialise une erreur LLM.
-
-        Args:
-            message: Description de l'erreur
-            context: Contexte additionnel (ex: prompt, modèle)
-            timestamp: Timestamp personnalisé (optionnel)
-        """
-        super().__init__(
-            message=message,
-            error_code="LLM_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context=context,
-        )
+    __slots__ = ()
+    _ERROR_CODE = ErrorCode.LLM_ERROR
 
 
 class PluginExecutionError(DomainError):
@@ -114,12 +173,14 @@ class PluginExecutionError(DomainError):
     Levée quand un plugin échoue à exécuter son action.
     """
 
+    __slots__ = ("_plugin_name", "_intent", "_raw_message")
+
     def __init__(
         self,
         plugin_name: str,
         intent: str,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -132,16 +193,29 @@ class PluginExecutionError(DomainError):
             context: Contexte additionnel
             timestamp: Timestamp personnalisé (optionnel)
         """
-        full_message = f"Plugin '{plugin_name}' failed to execute intent '{intent}': {message}"
-        super().__init__(
-            message=full_message,
-            error_code="PLUGIN_EXECUTION_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={"plugin": plugin_name, "intent": intent, **(context or {})},
+        BaseError.__init__(
+            self,
+            None,
+            ErrorCode.PLUGIN_EXECUTION_ERROR,
+            timestamp,
+            context,
         )
+        self._plugin_name = plugin_name
+        self._intent = intent
+        self._raw_message = message
+        self.args = (plugin_name, intent, message)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre au plugin en erreur."""
+        return {"plugin": self._plugin_name, "intent": self._intent}
 
+    def _format_message(self) -> str:
+        """Construit le message complet à partir du plugin et de l'intent."""
+        # f-string: le message peut ne pas être une str (None, exception...)
+        return f"{_plugin_prefix(self._plugin_name, self._intent)}{self._raw_message}"
 
-class ContextError(DomainError):
+
+class ContextError(DomainError, SimpleError):
     """
     Erreur lors de la gestion du contexte conversationnel.
 
@@ -149,23 +223,5 @@ class ContextError(DomainError):
     ou est corrompu.
     """
 
-    def __init__(
-        self,
-        message: str,
-        context: Optional[Dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
-    ):
-        """
-        Initialise une erreur de contexte.
-
-        Args:
-            message: Description de l'erreur
-            context: Contexte additionnel
-            timestamp: Timestamp personnalisé (optionnel)
-        """
-        super().__init__(
-            message=message,
-            error_code="CONTEXT_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context=context,
-        )
+    __slots__ = ()
+    _ERROR_CODE = ErrorCode.CONTEXT_ERROR
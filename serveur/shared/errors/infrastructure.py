@@ -5,18 +5,21 @@ Ces erreurs représentent des problèmes avec les systèmes externes
 (base de données, APIs, réseau, etc.).
 """
 
+from __future__ import annotations
+
 from datetime import datetime
 from typing import Optional, Dict, Any
-from shared.errors.base import BaseError
+from shared.errors.base import BaseError, ErrorContext, SimpleError, cached_format
+from shared.errors.codes import ErrorCode
 
 
 class InfrastructureError(BaseError):
     """Erreur d'infrastructure générique."""
 
-    pass
+    __slots__ = ()
 
 
-class DatabaseError(InfrastructureError):
+class DatabaseError(InfrastructureError, SimpleError):
     """
     Erreur lors de l'accès à la base de données.
 
@@ -24,26 +27,8 @@ class DatabaseError(InfrastructureError):
     ou timeouts.
     """
 
-    def __init__(
-        self,
-        message: str,
-        context: Optional[Dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
-    ):
-        """
-        Initialise une erreur de base de données.
-
-        Args:
-            message: Description de l'erreur
-            context: Contexte additionnel (ex: query, table)
-            timestamp: Timestamp personnalisé (optionnel)
-        """
-        super().__init__(
-            message=message,
-            error_code="DATABASE_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context=context,
-        )
+    __slots__ = ()
+    _ERROR_CODE = ErrorCode.DATABASE_ERROR
 
 
 class RedisError(InfrastructureError):
@@ -53,11 +38,15 @@ class RedisError(InfrastructureError):
     Levée lors de problèmes de connexion ou d'opérations Redis.
     """
 
+    __slots__ = ("_operation", "_raw_message")
+
+    _FMT = "Redis operation '%s' failed: %s"
+
     def __init__(
         self,
         message: str,
         operation: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -69,13 +58,18 @@ class RedisError(InfrastructureError):
             context: Contexte additionnel
             timestamp: Timestamp personnalisé (optionnel)
         """
-        full_message = f"Redis operation '{operation}' failed: {message}"
-        super().__init__(
-            message=full_message,
-            error_code="REDIS_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={"operation": operation, **(context or {})},
-        )
+        BaseError.__init__(self, None, ErrorCode.REDIS_ERROR, timestamp, context)
+        self._operation = operation
+        self._raw_message = message
+        self.args = (message, operation)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre à l'opération Redis."""
+        return {"operation": self._operation}
+
+    def _format_message(self) -> str:
+        """Construit le message complet à partir de l'opération Redis."""
+        return self._FMT % (self._operation, self._raw_message)
 
 
 class ExternalAPIError(InfrastructureError):
@@ -86,12 +80,23 @@ class ExternalAPIError(InfrastructureError):
     retourne une erreur ou est indisponible.
     """
 
+    __slots__ = ("_api_name", "_status_code", "_raw_message")
+
+    # Templates indexés par (code HTTP présent) << 1 | (message présent);
+    # str.format ignore les arguments non référencés par le template
+    _FMTS = (
+        "API '{0}' error: Unknown error",
+        "API '{0}' error: {2}",
+        "API '{0}' returned status {1}",
+        "API '{0}' returned status {1}: {2}",
+    )
+
     def __init__(
         self,
         api_name: str,
         status_code: Optional[int] = None,
         message: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -104,26 +109,25 @@ class ExternalAPIError(InfrastructureError):
             context: Contexte additionnel (ex: endpoint, params)
             timestamp: Timestamp personnalisé (optionnel)
         """
-        if status_code:
-            full_message = f"API '{api_name}' returned status {status_code}"
-            if message:
-                full_message += f": {message}"
-        else:
-            full_message = f"API '{api_name}' error: {message or 'Unknown error'}"
-
-        super().__init__(
-            message=full_message,
-            error_code="EXTERNAL_API_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={
-                "api_name": api_name,
-                "status_code": status_code,
-                **(context or {}),
-            },
+        BaseError.__init__(self, None, ErrorCode.EXTERNAL_API_ERROR, timestamp, context)
+        self._api_name = api_name
+        self._status_code = status_code
+        self._raw_message = message
+        self.args = (api_name, status_code, message)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre à l'API externe."""
+        return {"api_name": self._api_name, "status_code": self._status_code}
+
+    def _format_message(self) -> str:
+        """Construit le message complet selon le code HTTP et le message."""
+        index = (bool(self._status_code) << 1) | bool(self._raw_message)
+        return self._FMTS[index].format(
+            self._api_name, self._status_code, self._raw_message
         )
 
 
-class NetworkError(InfrastructureError):
+class NetworkError(InfrastructureError, SimpleError):
     """
     Erreur réseau générique.
 
@@ -131,26 +135,8 @@ class NetworkError(InfrastructureError):
     ou erreurs de communication réseau.
     """
 
-    def __init__(
-        self,
-        message: str,
-        context: Optional[Dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
-    ):
-        """
-        Initialise une erreur réseau.
-
-        Args:
-            message: Description de l'erreur
-            context: Contexte additionnel (ex: host, port)
-            timestamp: Timestamp personnalisé (optionnel)
-        """
-        super().__init__(
-            message=message,
-            error_code="NETWORK_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context=context,
-        )
+    __slots__ = ()
+    _ERROR_CODE = ErrorCode.NETWORK_ERROR
 
 
 class ConfigurationError(InfrastructureError):
@@ -161,11 +147,15 @@ class ConfigurationError(InfrastructureError):
     (variables d'environnement, fichiers de config, etc.).
     """
 
+    __slots__ = ("_field", "_raw_message")
+
+    _FMT = "Configuration error for '%s': %s"
+
     def __init__(
         self,
         field: str,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -177,13 +167,24 @@ class ConfigurationError(InfrastructureError):
             context: Contexte additionnel
             timestamp: Timestamp personnalisé (optionnel)
         """
-        full_message = f"Configuration error for '{field}': {message}"
-        super().__init__(
-            message=full_message,
-            error_code="CONFIGURATION_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={"field": field, **(context or {})},
+        BaseError.__init__(
+            self,
+            None,
+            ErrorCode.CONFIGURATION_ERROR,
+            timestamp,
+            context,
         )
+        self._field = field
+        self._raw_message = message
+        self.args = (field, message)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre au champ de configuration."""
+        return {"field": self._field}
+
+    def _format_message(self) -> str:
+        """Construit le message complet à partir du champ de configuration."""
+        return cached_format(self._FMT, self._field, self._raw_message)
 
 
 class ModelLoadError(InfrastructureError):
@@ -193,12 +194,16 @@ class ModelLoadError(InfrastructureError):
     Levée quand un modèle (LLM, STT, TTS) ne peut pas être chargé.
     """
 
+    __slots__ = ("_model_name", "_model_path", "_raw_message")
+
+    _FMT = "Failed to load model '%s' from '%s': %s"
+
     def __init__(
         self,
         model_name: str,
         model_path: str,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[ErrorContext] = None,
         timestamp: Optional[datetime] = None,
     ):
         """
@@ -211,14 +216,18 @@ class ModelLoadError(InfrastructureError):
             context: Contexte additionnel
             timestamp: Timestamp personnalisé (optionnel)
         """
-        full_message = f"Failed to load model '{model_name}' from '{model_path}': {message}"
-        super().__init__(
-            message=full_message,
-            error_code="MODEL_LOAD_ERROR",
-            timestamp=timestamp or datetime.utcnow(),
-            context={
-                "model_name": model_name,
-                "model_path": model_path,
-                **(context or {}),
-            },
+        BaseError.__init__(self, None, ErrorCode.MODEL_LOAD_ERROR, timestamp, context)
+        self._model_name = model_name
+        self._model_path = model_path
+        self._raw_message = message
+        self.args = (model_name, model_path, message)
+
+    def _own_context(self) -> Dict[str, Any]:
+        """Construit le contexte propre au modèle."""
+        return {"model_name": self._model_name, "model_path": self._model_path}
+
+    def _format_message(self) -> str:
+        """Construit le message complet à partir du modèle et de son chemin."""
+        return cached_format(
+            self._FMT, self._model_name, self._model_path, self._raw_message
         )
@@ -0,0 +1,18 @@
+"""
+Configuration du logging de Hive Mind.
+
+Usage:
+    from shared.logging import configure_logging
+
+    # Au démarrage du serveur
+    listener = configure_logging()
+    ...
+    # À l'arrêt
+    listener.stop()
+"""
+
+from shared.logging.setup import configure_logging
+
+__all__ = [
+    "configure_logging",
+]
@@ -0,0 +1,43 @@
+"""
+Mise en place des handlers de logging.
+
+Les modules émettent via `logging.getLogger(__name__)`; les
+enregistrements sont placés dans une queue et écrits par un thread
+dédié, pour que l'écriture sur stderr ne bloque jamais la boucle asyncio.
+"""
+
+from typing import Optional
+import logging
+import logging.handlers
+import queue
+
+from config import get_settings
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def configure_logging(level: Optional[str] = None) -> logging.handlers.QueueListener:
+    """
+    Configure le logger racine avec un QueueHandler.
+
+    Args:
+        level: Niveau de logging (défaut: depuis config)
+
+    Returns:
+        QueueListener démarré, à arrêter (stop()) lors de l'arrêt du serveur
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level or get_settings().log_level)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+
+    return listener
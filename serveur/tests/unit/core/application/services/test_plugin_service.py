@@ -0,0 +1,166 @@
+"""Tests unitaires du chargement des plugins (PluginLoader)."""
+
+import json
+import logging
+import os
+import textwrap
+
+import pytest
+
+from core.application.services import PluginLoader
+
+_DIRECT_HANDLER = '''
+from core.domain.interfaces import PluginInterface
+
+
+class {name}Plugin(PluginInterface):
+    async def execute(self, intent, params):
+        return {{"success": True, "version": "{version}"}}
+
+    def get_prompt_context(self):
+        return "{name} {version}"
+
+    def get_manifest(self):
+        return {{}}
+'''
+
+_INTERMEDIATE_HANDLER = '''
+from core.domain.interfaces import PluginInterface
+
+
+class Base(PluginInterface):
+    async def execute(self, intent, params):
+        return {{"success": True, "version": "{version}"}}
+
+    def get_manifest(self):
+        return {{}}
+
+
+class {name}Plugin(Base):
+    def get_prompt_context(self):
+        return "{name} {version}"
+'''
+
+_FAILING_HANDLER = '''
+from core.domain.interfaces import PluginInterface
+
+
+class FailingPlugin(PluginInterface):
+    async def on_load(self):
+        raise RuntimeError("connection refused")
+
+    async def execute(self, intent, params):
+        return {{"success": True}}
+
+    def get_prompt_context(self):
+        return "failing"
+
+    def get_manifest(self):
+        return {{}}
+'''
+
+
+def _write_plugin(plugins_dir, name, handler, version="1", mtime_ns=None):
+    """Crée (ou réécrit) un plugin dans le dossier de test."""
+    plugin_dir = plugins_dir / name
+    plugin_dir.mkdir(exist_ok=True)
+    manifest = {
+        "name": name,
+        "version": "1.0.0",
+        "description": f"{name} plugin",
+        "intents": ["run"],
+    }
+    (plugin_dir / "plugin.json").write_text(json.dumps(manifest))
+    handler_path = plugin_dir / "handler.py"
+    handler_path.write_text(
+        textwrap.dedent(handler.format(name=name.capitalize(), version=version))
+    )
+    if mtime_ns is not None:
+        # mtime explicite: la résolution du système de fichiers peut être grossière
+        os.utime(handler_path, ns=(mtime_ns, mtime_ns))
+
+
+class TestPluginDiscovery:
+    """Tests de la recherche de la classe du plugin"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "handler", [_DIRECT_HANDLER, _INTERMEDIATE_HANDLER], ids=["direct", "base"]
+    )
+    async def test_finds_plugin_class(self, tmp_path, handler):
+        """Doit trouver la sous-classe concrète, directe ou via une base"""
+        _write_plugin(tmp_path, "demo", handler)
+        loader = PluginLoader(tmp_path)
+
+        await loader.load_plugin("demo")
+
+        assert loader.get_plugin("demo").get_prompt_context() == "Demo 1"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "handler", [_DIRECT_HANDLER, _INTERMEDIATE_HANDLER], ids=["direct", "base"]
+    )
+    async def test_reload_picks_new_class(self, tmp_path, handler):
+        """Un handler modifié doit être réimporté, même via une classe de base"""
+        # ARRANGE
+        _write_plugin(tmp_path, "demo", handler, version="1", mtime_ns=10**18)
+        loader = PluginLoader(tmp_path)
+        await loader.load_plugin("demo")
+        await loader.unload_plugin("demo")
+
+        # ACT
+        _write_plugin(tmp_path, "demo", handler, version="2", mtime_ns=2 * 10**18)
+        await loader.load_plugin("demo")
+
+        # ASSERT
+        assert loader.get_plugin("demo").get_prompt_context() == "Demo 2"
+        assert "Demo 2" in loader.get_all_plugin_contexts()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_handler_reuses_cached_class(self, tmp_path):
+        """Doit réutiliser la classe importée si le handler n'a pas changé"""
+        _write_plugin(tmp_path, "demo", _DIRECT_HANDLER, mtime_ns=10**18)
+        loader = PluginLoader(tmp_path)
+        await loader.load_plugin("demo")
+        first_class = type(loader.get_plugin("demo"))
+        await loader.unload_plugin("demo")
+
+        await loader.load_plugin("demo")
+
+        assert type(loader.get_plugin("demo")) is first_class
+
+
+class TestLoadAllPlugins:
+    """Tests du chargement de tous les plugins"""
+
+    @pytest.mark.asyncio
+    async def test_skips_disabled_and_underscore_plugins(self, tmp_path):
+        """Doit ignorer les plugins listés dans .disabled et les dossiers _*"""
+        for name in ("alpha", "beta", "_template"):
+            _write_plugin(tmp_path, name, _DIRECT_HANDLER)
+        (tmp_path / ".disabled").write_text("# désactivés\n\nbeta\n")
+        loader = PluginLoader(tmp_path)
+
+        await loader.load_all_plugins()
+
+        assert set(loader.get_all_plugins()) == {"alpha"}
+
+    @pytest.mark.asyncio
+    async def test_failing_plugin_does_not_abort_others(self, tmp_path, caplog):
+        """Un on_load en échec ne doit pas empêcher le chargement des autres"""
+        _write_plugin(tmp_path, "gamma", _DIRECT_HANDLER)
+        _write_plugin(tmp_path, "failing", _FAILING_HANDLER)
+        _write_plugin(tmp_path, "alpha", _DIRECT_HANDLER)
+        loader = PluginLoader(tmp_path)
+
+        with caplog.at_level(logging.WARNING):
+            await loader.load_all_plugins()
+
+        assert set(loader.get_all_plugins()) == {"alpha", "gamma"}
+        (record,) = caplog.records
+        assert record.plugin_name == "failing"
+        assert "connection refused" in record.getMessage()
+        assert record.exc_info is not None
+        assert loader.get_all_plugin_contexts() == (
+            "## alpha plugin\nAlpha 1\n\n## gamma plugin\nGamma 1"
+        )
@@ -0,0 +1,244 @@
+"""Tests unitaires de Phi3Model (streaming, en-tête GGUF)."""
+
+import asyncio
+import logging
+import struct
+import time
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+from config import get_settings
+from core.infrastructure.llm import phi3_model
+from core.infrastructure.llm.phi3_model import Phi3Model
+from shared.errors import LLMError, ModelLoadError
+
+
+class StubLlama:
+    """Modèle factice: streame des chunks de texte prédéfinis."""
+
+    def __init__(self, chunks, error=None, delay=0.0):
+        self.chunks = chunks
+        self.error = error
+        self.delay = delay
+        self.produced = 0
+        self.closed = False
+
+    def tokenize(self, text, add_bos=True, special=False):
+        return [0]
+
+    def create_completion(self, prompt, **kwargs):
+        assert kwargs["stream"] is True
+        return self._stream()
+
+    def _stream(self):
+        try:
+            for chunk in self.chunks:
+                if self.delay:
+                    time.sleep(self.delay)
+                self.produced += 1
+                yield {"choices": [{"text": chunk, "finish_reason": None}]}
+            if self.error is not None:
+                raise self.error
+            yield {"choices": [{"text": "", "finish_reason": "length"}]}
+        finally:
+            self.closed = True
+
+
+def _make_model(stub):
+    """Phi3Model déjà « chargé » avec le modèle factice."""
+    model = Phi3Model(model_path="/models/stub.gguf")
+    model._model = stub
+    model._is_loaded = True
+    return model
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestGenerateStreaming:
+    """Tests de generate_streaming"""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_chunks(self):
+        """Doit émettre tout le texte généré"""
+        model = _make_model(StubLlama(["Bon", "jour", " !"]))
+
+        chunks = await asyncio.wait_for(_collect(model.generate_streaming("Hi")), 5)
+
+        assert "".join(chunks) == "Bonjour !"
+
+    @pytest.mark.asyncio
+    async def test_tokens_are_coalesced(self):
+        """Doit regrouper des tokens produits au fil de l'eau en moins de yields"""
+        tokens = [f"{i % 10}" for i in range(60)]
+        model = _make_model(StubLlama(tokens, delay=0.001))
+
+        chunks = await asyncio.wait_for(_collect(model.generate_streaming("Hi")), 5)
+
+        assert "".join(chunks) == "".join(tokens)
+        assert len(chunks) <= len(tokens) // 2
+
+    @pytest.mark.asyncio
+    async def test_stop_sequence_split_across_chunks_is_cut(self):
+        """Doit couper une séquence de stop répartie sur plusieurs chunks"""
+        stub = StubLlama(["Hello <|e", "nd|> ignored", " more"])
+        model = _make_model(stub)
+
+        chunks = await asyncio.wait_for(_collect(model.generate_streaming("Hi")), 5)
+
+        assert "".join(chunks) == "Hello "
+        assert not any("<|" in chunk for chunk in chunks)
+
+    @pytest.mark.asyncio
+    async def test_partial_stop_prefix_is_released_at_end(self):
+        """Doit émettre un début de séquence de stop qui n'en était pas une"""
+        model = _make_model(StubLlama(["a <", "|x"]))
+
+        chunks = await asyncio.wait_for(_collect(model.generate_streaming("Hi")), 5)
+
+        assert "".join(chunks) == "a <|x"
+
+    @pytest.mark.asyncio
+    async def test_early_close_stops_producer(self):
+        """Un arrêt anticipé ne doit ni bloquer ni laisser le décodage tourner"""
+        # ARRANGE
+        stub = StubLlama(["x"] * 10_000)
+        model = _make_model(stub)
+        stream = model.generate_streaming("Hi")
+
+        # ACT
+        first = await asyncio.wait_for(stream.__anext__(), 5)
+        # Laisser le producteur remplir la queue bornée
+        await asyncio.sleep(0.1)
+        produced_while_idle = stub.produced
+        await asyncio.wait_for(stream.aclose(), 5)
+
+        # ASSERT
+        assert first
+        # Premier lot (au plus un seuil de regroupement) + queue pleine
+        assert produced_while_idle <= (
+            phi3_model._STREAM_COALESCE_CHARS + phi3_model._STREAM_QUEUE_SIZE + 2
+        )
+        assert stub.closed
+        assert not model._gen_lock.locked()
+
+    @pytest.mark.asyncio
+    async def test_producer_exception_raises_llm_error(self):
+        """Doit lever LLMError si le décodage échoue"""
+        stub = StubLlama(["partial"], error=RuntimeError("decode failed"))
+        model = _make_model(stub)
+
+        with pytest.raises(LLMError) as exc_info:
+            await asyncio.wait_for(_collect(model.generate_streaming("Hi")), 5)
+
+        assert "decode failed" in exc_info.value.message
+        assert exc_info.value.context["error_type"] == "RuntimeError"
+        assert not model._gen_lock.locked()
+
+    @pytest.mark.asyncio
+    async def test_unload_while_waiting_for_lock_raises_llm_error(self):
+        """Un unload() passé avant le tour d'une génération doit lever LLMError"""
+        # ARRANGE
+        model = _make_model(StubLlama(["x"] * 50, delay=0.001))
+        first = model.generate_streaming("Hi")
+        await asyncio.wait_for(first.__anext__(), 5)
+
+        # ACT: unload puis seconde génération, en file derrière la première
+        unload = asyncio.create_task(model.unload())
+        second = asyncio.create_task(_collect(model.generate_streaming("Hi")))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(_collect(first), 5)
+        await asyncio.wait_for(unload, 5)
+
+        # ASSERT
+        with pytest.raises(LLMError) as exc_info:
+            await asyncio.wait_for(second, 5)
+        assert exc_info.value.message == "Model not loaded"
+        assert not model._gen_lock.locked()
+
+
+def _gguf_string(text):
+    data = text.encode("utf-8")
+    return struct.pack("<Q", len(data)) + data
+
+
+def _write_gguf(path, file_type):
+    """Écrit un en-tête GGUF v3 minimal (vocabulaire puis general.file_type)."""
+    kvs = [
+        _gguf_string("general.name") + struct.pack("<I", 8) + _gguf_string("phi3"),
+        _gguf_string("tokenizer.ggml.tokens")
+        + struct.pack("<IIQ", 9, 8, 3)
+        + b"".join(_gguf_string(token) for token in ("a", "bb", "ccc")),
+        _gguf_string("tokenizer.ggml.scores")
+        + struct.pack("<IIQ", 9, 6, 3)
+        + struct.pack("<3f", 0.0, 1.0, 2.0),
+        _gguf_string("general.file_type") + struct.pack("<II", 4, file_type),
+    ]
+    path.write_bytes(struct.pack("<4sIQQ", b"GGUF", 3, 0, len(kvs)) + b"".join(kvs))
+    return str(path)
+
+
+class TestGgufFileType:
+    """Tests de la lecture de la quantification dans l'en-tête GGUF"""
+
+    def test_reads_file_type_after_arrays(self, tmp_path):
+        """Doit sauter les tableaux du tokenizer et lire general.file_type"""
+        path = _write_gguf(tmp_path / "model.gguf", 15)
+
+        assert phi3_model._read_gguf_file_type(path) == 15
+
+    def test_returns_none_for_invalid_file(self, tmp_path):
+        """Doit retourner None pour un fichier qui n'est pas un GGUF"""
+        path = tmp_path / "model.gguf"
+        path.write_bytes(b"not a gguf file")
+
+        assert phi3_model._read_gguf_file_type(str(path)) is None
+
+    @pytest.mark.asyncio
+    async def test_unquantized_model_warns_before_loading(
+        self, tmp_path, monkeypatch, caplog
+    ):
+        """Doit avertir d'un GGUF F16 depuis l'en-tête, avant le chargement"""
+        # ARRANGE
+        path = _write_gguf(tmp_path / "model.gguf", 1)
+
+        def fail_load(**kwargs):
+            raise RuntimeError("load failed")
+
+        monkeypatch.setattr(phi3_model, "Llama", fail_load)
+        model = Phi3Model(model_path=path)
+
+        # ACT
+        with caplog.at_level(logging.WARNING, logger=phi3_model.__name__):
+            with pytest.raises(ModelLoadError) as exc_info:
+                await model._load_model()
+
+        # ASSERT
+        assert "unquantized F16 weights" in caplog.text
+        assert exc_info.value.context["file_type"] == 1
+        assert exc_info.value.context["preferred_quant"] == "Q4_K_M"
+
+
+class TestKvCacheType:
+    """Tests du choix du type de cache KV"""
+
+    @pytest.fixture
+    def f16_settings(self, monkeypatch):
+        """Configuration rechargée avec un cache KV f16"""
+        monkeypatch.setenv("LLM_KV_CACHE_TYPE", "f16")
+        get_settings.cache_clear()
+        yield
+        get_settings.cache_clear()
+
+    def test_large_f16_context_warns(self, f16_settings, caplog):
+        """Un contexte de 4096 tokens en f16 doit suggérer un cache quantifié"""
+        model = Phi3Model(model_path="/models/stub.gguf", n_ctx=4096)
+
+        with caplog.at_level(logging.WARNING, logger=phi3_model.__name__):
+            kv_cache_type = model._resolve_kv_cache_type()
+
+        assert kv_cache_type == phi3_model.GGML_TYPE_F16
+        assert "LLM_KV_CACHE_TYPE=q8_0" in caplog.text
@@ -0,0 +1,182 @@
+"""Tests unitaires de RedisContext (stockage hash + index, migration)."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from core.domain.interfaces import Message
+from core.infrastructure.redis import redis_context
+from core.infrastructure.redis.redis_context import RedisContext
+from shared.errors import RedisError
+
+
+@pytest.fixture
+def server():
+    """Serveur Redis en mémoire partagé par le contexte et le test."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def raw(server):
+    """Connexion directe au serveur, pour préparer et inspecter les clés."""
+    return fakeredis.aioredis.FakeRedis(server=server)
+
+
+@pytest.fixture
+def make_context(server, monkeypatch):
+    """Fabrique de RedisContext connectés au serveur en mémoire."""
+
+    async def fake_from_url(url, **kwargs):
+        return fakeredis.aioredis.FakeRedis(server=server)
+
+    monkeypatch.setattr(redis_context.redis, "from_url", fake_from_url)
+    return lambda: RedisContext(redis_url="redis://test", ttl_seconds=3600)
+
+
+def _legacy_payload(content, timestamp):
+    """Message JSON de l'ancien format (liste Redis)."""
+    return json.dumps(
+        {
+            "role": "user",
+            "content": content,
+            "timestamp": timestamp.isoformat(),
+            "client_id": None,
+            "metadata": {},
+        }
+    )
+
+
+class TestLegacyMigration:
+    """Tests de la migration de l'ancienne liste de messages"""
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_list(self, make_context, raw):
+        """Doit migrer la liste, écarter les entrées corrompues et la supprimer"""
+        # ARRANGE
+        start = datetime.utcnow() - timedelta(hours=1)
+        await raw.rpush(
+            "hivemind:context:messages",
+            _legacy_payload("m0", start),
+            b"\x01corrupted",
+            _legacy_payload("m1", start + timedelta(seconds=1)),
+        )
+        context = make_context()
+
+        # ACT
+        messages = await context.get_messages()
+
+        # ASSERT
+        assert [m.content for m in messages] == ["m0", "m1"]
+        assert not await raw.exists(
+            "hivemind:context:messages", "hivemind:context:messages:migrating"
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_migration_does_not_duplicate(self, make_context, raw):
+        """Reprendre ou répéter une migration ne doit pas dupliquer les messages"""
+        # ARRANGE
+        start = datetime.utcnow() - timedelta(hours=1)
+        payloads = [
+            _legacy_payload(f"m{i}", start + timedelta(seconds=i)) for i in range(3)
+        ]
+        await raw.rpush("hivemind:context:messages", *payloads)
+        first, second = make_context(), make_context()
+        # Migration interrompue: la liste a été renommée mais pas migrée
+        await raw.rename(
+            "hivemind:context:messages", "hivemind:context:messages:migrating"
+        )
+
+        # ACT
+        await first._migrate_legacy_list(raw)
+        await second._migrate_legacy_list(raw)
+        # Même liste migrée une seconde fois (reprise après coupure)
+        await raw.rpush("hivemind:context:messages:migrating", *payloads)
+        await first._migrate_legacy_list(raw)
+
+        # ASSERT
+        assert [m.content for m in await first.get_messages()] == ["m0", "m1", "m2"]
+        assert await first.get_context_size() == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_migration_is_retried(self, make_context, raw, monkeypatch):
+        """Un échec de migration ne doit pas laisser la connexion en cache"""
+        # ARRANGE
+        await raw.rpush(
+            "hivemind:context:messages", _legacy_payload("m0", datetime.utcnow())
+        )
+        context = make_context()
+        migrate = RedisContext._migrate_legacy_list
+
+        async def failing_migrate(self, r):
+            raise ConnectionError("connection lost")
+
+        monkeypatch.setattr(RedisContext, "_migrate_legacy_list", failing_migrate)
+
+        # ACT & ASSERT
+        with pytest.raises(RedisError):
+            await context.get_messages()
+
+        monkeypatch.setattr(RedisContext, "_migrate_legacy_list", migrate)
+        assert [m.content for m in await context.get_messages()] == ["m0"]
+
+
+class TestMessages:
+    """Tests de lecture et de purge des messages"""
+
+    @pytest_asyncio.fixture
+    async def context(self, make_context):
+        """Contexte contenant m0..m4, à une seconde d'intervalle"""
+        context = make_context()
+        context.start = datetime.utcnow() - timedelta(minutes=1)
+        r = await context._get_redis()
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(5):
+                message = Message(
+                    role="user",
+                    content=f"m{i}",
+                    timestamp=context.start + timedelta(seconds=i),
+                )
+                context._queue_message(pipe, message)
+            await pipe.execute()
+        yield context
+        await context.close()
+
+    @pytest.mark.asyncio
+    async def test_get_messages_with_limit(self, context):
+        """Doit retourner les N derniers messages, du plus ancien au plus récent"""
+        messages = await context.get_messages(limit=2)
+
+        assert [m.content for m in messages] == ["m3", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_get_messages_since(self, context):
+        """Doit retourner les messages postérieurs ou égaux à la date"""
+        since = context.start + timedelta(seconds=2)
+
+        messages = await context.get_messages(since=since)
+
+        assert [m.content for m in messages] == ["m2", "m3", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_get_messages_since_with_limit(self, context):
+        """Doit combiner date et limite en gardant les plus récents"""
+        messages = await context.get_messages(
+            limit=2, since=context.start + timedelta(seconds=1)
+        )
+
+        assert [m.content for m in messages] == ["m3", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_prune_old_messages(self, context):
+        """Doit supprimer les messages strictement antérieurs à la date"""
+        before = context.start + timedelta(seconds=2)
+
+        pruned = await context.prune_old_messages(before)
+
+        assert pruned == 2
+        assert [m.content for m in await context.get_messages()] == ["m2", "m3", "m4"]
+        assert await context.get_context_size() == 3
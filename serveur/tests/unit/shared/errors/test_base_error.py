@@ -0,0 +1,65 @@
+"""Tests unitaires de BaseError (sérialisation pickle)."""
+
+import pickle
+
+import pytest
+
+from shared.errors import (
+    ConfigurationError,
+    ExternalAPIError,
+    LLMError,
+    ModelLoadError,
+    PluginExecutionError,
+    RedisError,
+    ValidationError,
+)
+
+
+class TestPickle:
+    """Tests de l'aller-retour pickle des erreurs"""
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ValidationError("email", "invalid", context={"value": 1}),
+            PluginExecutionError("weather", "get_weather", "timeout"),
+            ExternalAPIError("OpenWeather", 503, "unavailable"),
+            ExternalAPIError("OpenWeather"),
+            ConfigurationError("redis_url", "missing"),
+            ModelLoadError("Phi-3-mini", "/models/phi3.gguf", "not found"),
+            RedisError("connection refused", "get"),
+            LLMError("generation failed"),
+        ],
+        ids=lambda error: type(error).__name__,
+    )
+    def test_round_trip(self, error):
+        """Doit restaurer la classe, les champs, le message et le contexte"""
+        # ACT
+        restored = pickle.loads(pickle.dumps(error))
+
+        # ASSERT
+        assert type(restored) is type(error)
+        assert restored.args == error.args
+        assert str(restored) == str(error)
+        assert restored.timestamp == error.timestamp
+        assert restored.to_dict() == error.to_dict()
+
+    def test_round_trip_with_lazy_context(self):
+        """Doit résoudre un contexte fourni par une lambda avant de sérialiser"""
+        # ARRANGE
+        error = ModelLoadError(
+            "Phi-3-mini", "/models/phi3.gguf", "oom", context=lambda: {"n_ctx": 4096}
+        )
+
+        # ACT
+        restored = pickle.loads(pickle.dumps(error))
+
+        # ASSERT
+        assert restored.context == {
+            "model_name": "Phi-3-mini",
+            "model_path": "/models/phi3.gguf",
+            "n_ctx": 4096,
+        }
+        assert restored.message == (
+            "Failed to load model 'Phi-3-mini' from '/models/phi3.gguf': oom"
+        )
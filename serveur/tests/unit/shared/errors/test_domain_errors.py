@@ -0,0 +1,97 @@
+"""Tests unitaires des erreurs du domaine."""
+
+from shared.errors import PluginExecutionError, ValidationError
+
+
+class TestValidationErrorPool:
+    """Tests du pool d'instances de ValidationError (build / release)"""
+
+    def test_build_reuses_released_instance(self):
+        """Doit réutiliser l'instance libérée avec les nouveaux champs"""
+        # ARRANGE
+        first = ValidationError.build("email", "invalid", context={"v": 1})
+        first.to_dict()
+        first.release()
+
+        # ACT
+        second = ValidationError.build("age", "negative")
+
+        # ASSERT
+        assert second is first
+        assert second.args == ("age", "negative")
+        assert second.message == "Validation failed for 'age': negative"
+        assert second.context == {"field": "age"}
+        assert second.to_dict()["context"] == {"field": "age"}
+        second.release()
+
+    def test_release_resets_exception_state(self):
+        """Ne doit conserver ni traceback, ni cause, ni notes d'une utilisation"""
+        # ARRANGE
+        error = ValidationError.build("email", "invalid")
+        error.add_note("n1")
+        try:
+            try:
+                raise KeyError("email")
+            except KeyError:
+                raise error from None
+        except ValidationError:
+            pass
+        error.release()
+
+        # ACT
+        reused = ValidationError.build("email", "invalid")
+
+        # ASSERT
+        assert reused is error
+        assert reused.__traceback__ is None
+        assert reused.__cause__ is None
+        assert reused.__context__ is None
+        assert reused.__suppress_context__ is False
+        assert not hasattr(reused, "__notes__")
+        reused.release()
+
+    def test_build_without_released_instance(self):
+        """Doit créer une nouvelle instance si le pool est vide"""
+        first = ValidationError.build("a", "x")
+        second = ValidationError.build("b", "y")
+
+        assert first is not second
+        assert isinstance(first, ValidationError)
+        assert str(second) == "[VALIDATION_ERROR] Validation failed for 'b': y"
+
+
+class TestValidationErrorMessage:
+    """Tests du message (formaté et mis en cache) de ValidationError"""
+
+    def test_unhashable_message_is_formatted(self):
+        """Doit formater un message non hashable sans lever TypeError"""
+        error = ValidationError("f", ["x"])
+
+        assert error.message == "Validation failed for 'f': ['x']"
+        assert error.to_dict()["message"] == error.message
+
+    def test_equal_values_of_different_types_do_not_collide(self):
+        """Ne doit pas réutiliser le message d'une valeur égale d'un autre type"""
+        assert ValidationError("f", 1).message == "Validation failed for 'f': 1"
+        assert ValidationError("f", True).message == "Validation failed for 'f': True"
+
+
+class TestPluginExecutionErrorMessage:
+    """Tests du message de PluginExecutionError"""
+
+    def test_message_includes_plugin_and_intent(self):
+        """Doit préfixer le message avec le plugin et l'intent"""
+        error = PluginExecutionError("weather", "get_weather", "timeout")
+
+        assert error.message == (
+            "Plugin 'weather' failed to execute intent 'get_weather': timeout"
+        )
+
+    def test_non_string_message_is_rendered(self):
+        """Doit formater un message qui n'est pas une str"""
+        error = PluginExecutionError("weather", "get_weather", None)
+
+        assert str(error) == (
+            "[PLUGIN_EXECUTION_ERROR] "
+            "Plugin 'weather' failed to execute intent 'get_weather': None"
+        )
@@ -0,0 +1,35 @@
+"""Tests unitaires de la configuration (Settings)."""
+
+from config import Settings
+
+
+class TestSettings:
+    """Tests des propriétés dérivées de Settings"""
+
+    def test_copy_with_update_is_not_stale(self):
+        """Une copie modifiée ne doit pas reprendre les valeurs en cache"""
+        settings = Settings(environment="development")
+        settings.model_dump_safe()
+
+        copied = settings.model_copy(update={"environment": "production"})
+
+        assert copied.is_production
+        assert copied.model_dump_safe()["environment"] == "production"
+        assert settings.model_dump_safe()["environment"] == "development"
+
+    def test_assignment_is_not_stale(self):
+        """Une assignation doit invalider le dump sécurisé en cache"""
+        settings = Settings(environment="development")
+        settings.model_dump_safe()
+
+        settings.environment = "production"
+
+        assert settings.is_production
+        assert not settings.is_development
+        assert settings.model_dump_safe()["environment"] == "production"
+
+    def test_secrets_are_masked(self):
+        """Doit masquer les secrets renseignés"""
+        settings = Settings(openweather_api_key="secret")
+
+        assert settings.model_dump_safe()["openweather_api_key"] == "***MASKED***"